@@ -12,13 +12,20 @@
 
 import os
 import json
+import atexit
 import logging
-from pathlib import Path
+import threading
 from typing import Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 
+# 可选：orjson在C层完成JSON编解码，不可用时回退到标准库json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+
+@dataclass(slots=True)
 class AppConfig:
     """应用程序配置类"""
 
@@ -62,29 +69,43 @@ class AppConfig:
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
-        return asdict(self)
+        # 所有字段都是标量，直接取值即可，无需asdict的递归深拷贝
+        return {name: getattr(self, name) for name in _CONFIG_FIELDS}
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'AppConfig':
         """从字典创建配置"""
-        return cls(**data)
+        return cls(**{key: value for key, value in data.items() if key in _CONFIG_FIELD_SET})
+
+
+# 配置字段名（保持声明顺序），以及用于O(1)判断的集合
+_CONFIG_FIELDS = tuple(f.name for f in fields(AppConfig))
+_CONFIG_FIELD_SET = frozenset(_CONFIG_FIELDS)
 
 
 class ConfigManager:
     """配置管理器"""
 
+    # 延迟写盘时间(秒)，期间的多次修改合并为一次保存
+    SAVE_DELAY = 0.5
+
     def __init__(self, config_file: str = "app_config.json"):
-        self.config_file = Path(config_file)
+        self.config_file = config_file
         self.config = AppConfig()
+        self._dirty = False
+        self._timer = None
+        self._lock = threading.Lock()
         self._load_config()
+        atexit.register(self.flush)
 
     def _load_config(self):
         """加载配置文件"""
         try:
-            if self.config_file.exists():
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.config = AppConfig.from_dict(data)
+            if os.path.exists(self.config_file):
+                with open(self.config_file, 'rb') as f:
+                    raw = f.read()
+                data = orjson.loads(raw) if orjson is not None else json.loads(raw.decode('utf-8'))
+                self.config = AppConfig.from_dict(data)
                 logging.info(f"配置文件加载成功: {self.config_file}")
             else:
                 self._save_config()  # 创建默认配置文件
@@ -96,37 +117,65 @@ class ConfigManager:
     def _save_config(self):
         """保存配置文件"""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config.to_dict(), f, ensure_ascii=False, indent=2)
+            if orjson is not None:
+                # orjson直接输出UTF-8字节，等价于ensure_ascii=False
+                with open(self.config_file, 'wb') as f:
+                    f.write(orjson.dumps(self.config.to_dict(), option=orjson.OPT_INDENT_2))
+            else:
+                with open(self.config_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.config.to_dict(), f, ensure_ascii=False, indent=2)
             logging.info(f"配置文件保存成功: {self.config_file}")
         except Exception as e:
             logging.error(f"配置文件保存失败: {e}")
 
+    def _schedule_save(self):
+        """标记配置已修改，延迟保存以合并连续的写操作"""
+        with self._lock:
+            self._dirty = True
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.SAVE_DELAY, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """立即写入尚未保存的修改"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+            self._save_config()
+
     def get(self, key: str, default: Any = None) -> Any:
         """获取配置项"""
-        return getattr(self.config, key, default)
+        if key in _CONFIG_FIELD_SET:
+            return getattr(self.config, key)
+        return default
 
     def set(self, key: str, value: Any):
         """设置配置项"""
-        if hasattr(self.config, key):
+        if key in _CONFIG_FIELD_SET:
             setattr(self.config, key, value)
-            self._save_config()
+            self._schedule_save()
         else:
             logging.warning(f"未知的配置项: {key}")
 
     def update(self, **kwargs):
         """批量更新配置"""
         for key, value in kwargs.items():
-            if hasattr(self.config, key):
+            if key in _CONFIG_FIELD_SET:
                 setattr(self.config, key, value)
             else:
                 logging.warning(f"未知的配置项: {key}")
-        self._save_config()
+        self._schedule_save()
 
     def reset_to_default(self):
         """重置为默认配置"""
         self.config = AppConfig()
-        self._save_config()
+        self._schedule_save()
         logging.info("配置已重置为默认值")
 
 
@@ -146,6 +195,13 @@ SUPPORTED_FORMATS = {
     'table': ['.dbf', '.csv', '.xlsx', '.xls']
 }
 
+# 扩展名 -> 格式类别（由SUPPORTED_FORMATS反查生成）
+_EXT_TO_CATEGORY = {
+    ext: category
+    for category, extensions in SUPPORTED_FORMATS.items()
+    for ext in extensions
+}
+
 # 几何类型映射
 GEOMETRY_TYPE_MAP = {
     'Point': '点',
@@ -181,18 +237,33 @@ DEFAULT_FIELD_STANDARDS = {
     }
 }
 
-# 全局配置实例
-config_manager = ConfigManager()
+# 全局配置实例（首次使用时才创建，导入模块时不读取配置文件）
+_config_manager: Optional[ConfigManager] = None
+
+
+def _get_config_manager() -> ConfigManager:
+    """获取全局配置管理器，必要时创建"""
+    global _config_manager
+    if _config_manager is None:
+        _config_manager = ConfigManager()
+    return _config_manager
+
+
+def __getattr__(name: str):
+    """兼容旧的模块属性 config_manager（PEP 562）"""
+    if name == 'config_manager':
+        return _get_config_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_config() -> AppConfig:
     """获取全局配置"""
-    return config_manager.config
+    return _get_config_manager().config
 
 
 def update_config(**kwargs):
     """更新全局配置"""
-    config_manager.update(**kwargs)
+    _get_config_manager().update(**kwargs)
 
 
 def get_error_level(level_name: str) -> str:
@@ -202,8 +273,9 @@ def get_error_level(level_name: str) -> str:
 
 def is_supported_format(file_path: str, format_type: str = 'vector') -> bool:
     """检查文件格式是否支持"""
-    file_ext = Path(file_path).suffix.lower()
-    return file_ext in SUPPORTED_FORMATS.get(format_type, [])
+    # 去掉末尾分隔符，使GDB目录路径同样可以识别
+    file_ext = os.path.splitext(os.fspath(file_path).rstrip('/\\'))[1].lower()
+    return _EXT_TO_CATEGORY.get(file_ext) == format_type
 
 
 def get_geometry_type_name(geom_type: str) -> str:
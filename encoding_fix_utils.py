@@ -5,10 +5,48 @@
 专门处理乱码和编码转换问题
 """
 
+import codecs
 import logging
 
+# 可选：charset_normalizer按字节分布和语言模型为候选编码打分
+try:
+    from charset_normalizer import from_bytes
+except ImportError:
+    from_bytes = None
+
 logger = logging.getLogger(__name__)
 
+# 乱码修复时依次尝试的目标编码
+_GARBLED_ENCODINGS = ('gbk', 'gb2312', 'utf-8')
+
+# charset_normalizer选出的编码：检测开销大，只在首次遇到乱码时运行一次，之后优先按该编码直接解码
+_detected_encoding = None
+
+# UTF-8字节序标记
+_UTF8_BOM = b'\xef\xbb\xbf'
+
+# 常见的书名号和其他特殊字符映射
+_DISPLAY_CHAR_TABLE = str.maketrans({
+    # 书名号
+    '\u300a': '《',  # 左书名号
+    '\u300b': '》',  # 右书名号
+    # 引号
+    '\u201c': '"',   # 左双引号
+    '\u201d': '"',   # 右双引号
+    '\u2018': "'",   # 左单引号
+    '\u2019': "'",   # 右单引号
+    # 破折号
+    '\u2014': '—',   # 长破折号
+    '\u2013': '–',   # 短破折号
+    # 省略号
+    '\u2026': '...', # 省略号
+    # 其他常见符号
+    '\u00a0': ' ',   # 不间断空格
+    '\u200b': '',    # 零宽空格
+    '\u200c': '',    # 零宽非连接符
+    '\u200d': '',    # 零宽连接符
+})
+
 def fix_garbled_text(text):
     """
     修复乱码文本
@@ -27,32 +65,32 @@ def fix_garbled_text(text):
         return text
 
     # 检查是否包含乱码字符（高字节字符）
-    if any(ord(c) > 127 for c in text[:min(10, len(text))]):
-        # 尝试修复乱码
+    if not text[:10].isascii():
+        # 乱码文本的每个字符都应落在latin1范围内，只编码一次并复用
         try:
-            # 方法1：尝试从latin1重新解码
-            for encoding in ['gbk', 'gb2312', 'utf-8']:
-                try:
-                    # 先编码为latin1，再解码为目标编码
-                    encoded = text.encode('latin1')
-                    decoded = encoded.decode(encoding)
-                    logger.info(f"成功修复乱码: {text[:20]}... -> {decoded[:20]}...")
-                    return decoded
-                except (UnicodeEncodeError, UnicodeDecodeError):
-                    continue
-
-            # 方法2：直接尝试不同编码
-            for encoding in ['gbk', 'gb2312', 'utf-8']:
-                try:
-                    decoded = text.encode('latin1').decode(encoding)
-                    if decoded != text:  # 确保有变化
-                        logger.info(f"成功修复乱码: {text[:20]}... -> {decoded[:20]}...")
-                        return decoded
-                except (UnicodeEncodeError, UnicodeDecodeError):
-                    continue
-
-        except Exception as e:
-            logger.warning(f"修复乱码失败: {e}")
+            probe = text.encode('latin1')
+        except UnicodeEncodeError:
+            # 含有latin1之外的字符，说明文本本身已是正常解码结果
+            return text
+
+        # 首次遇到乱码时按打分选择最可信的编码，避免gbk对非中文字节的"误解码"
+        global _detected_encoding
+        if from_bytes is not None and _detected_encoding is None:
+            best = from_bytes(probe, cp_isolation=list(_GARBLED_ENCODINGS)).best()
+            if best is not None:
+                _detected_encoding = codecs.lookup(best.encoding).name
+
+        encodings = _GARBLED_ENCODINGS
+        if _detected_encoding is not None:
+            encodings = (_detected_encoding,) + tuple(e for e in _GARBLED_ENCODINGS if e != _detected_encoding)
+
+        for encoding in encodings:
+            try:
+                decoded = probe.decode(encoding)
+            except UnicodeDecodeError:
+                continue
+            logger.info(f"成功修复乱码: {text[:20]}... -> {decoded[:20]}...")
+            return decoded
 
     return text
 
@@ -69,33 +107,31 @@ def fix_special_chars_for_display(text):
     if not isinstance(text, str):
         return str(text)
 
-    # 常见的书名号和其他特殊字符映射
-    char_mapping = {
-        # 书名号
-        '\u300a': '《',  # 左书名号
-        '\u300b': '》',  # 右书名号
-        # 引号
-        '\u201c': '"',   # 左双引号
-        '\u201d': '"',   # 右双引号
-        '\u2018': "'",   # 左单引号
-        '\u2019': "'",   # 右单引号
-        # 破折号
-        '\u2014': '—',   # 长破折号
-        '\u2013': '–',   # 短破折号
-        # 省略号
-        '\u2026': '...', # 省略号
-        # 其他常见符号
-        '\u00a0': ' ',   # 不间断空格
-        '\u200b': '',    # 零宽空格
-        '\u200c': '',    # 零宽非连接符
-        '\u200d': '',    # 零宽连接符
-    }
-
-    # 应用字符映射
-    for unicode_char, replacement in char_mapping.items():
-        text = text.replace(unicode_char, replacement)
+    # 映射表中全部是非ASCII字符，纯ASCII文本无需处理
+    if text.isascii():
+        return text
 
-    return text
+    # 单次遍历完成所有字符映射
+    return text.translate(_DISPLAY_CHAR_TABLE)
+
+def fix_text_for_display(text):
+    """
+    修复乱码并替换特殊字符，一次完成fix_garbled_text和fix_special_chars_for_display
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        修复后的文本
+    """
+    if not isinstance(text, str):
+        return str(text)
+
+    # 两步处理都只针对非ASCII字符，纯ASCII文本一次检查即可返回
+    if text.isascii():
+        return text
+
+    return fix_garbled_text(text).translate(_DISPLAY_CHAR_TABLE)
 
 def safe_decode_bytes(data):
     """
@@ -108,16 +144,19 @@ def safe_decode_bytes(data):
         解码后的字符串
     """
     if isinstance(data, bytes):
-        # 尝试多种编码
-        for encoding in ['utf-8', 'gbk', 'gb2312', 'latin1']:
-            try:
-                decoded = data.decode(encoding)
-                return decoded
-            except UnicodeDecodeError:
-                continue
+        # 纯ASCII数据直接解码，不触发任何异常
+        if data.isascii():
+            return data.decode('ascii')
 
-        # 如果所有编码都失败，使用错误替换
-        return data.decode('utf-8', errors='replace')
+        # 依次尝试UTF-8和GBK（gb2312是GBK的子集，latin1可解码任意字节）
+        try:
+            return data.decode('utf-8')
+        except UnicodeDecodeError:
+            pass
+        try:
+            return data.decode('gbk')
+        except UnicodeDecodeError:
+            return data.decode('latin1')
 
     return str(data)
 
@@ -156,16 +195,20 @@ def detect_encoding(data):
         最可能的编码
     """
     if isinstance(data, bytes):
-        # 简单的编码检测
-        try:
-            data.decode('utf-8')
+        # 带BOM或纯ASCII的数据无需试解码
+        if data.startswith(_UTF8_BOM) or data.isascii():
             return 'utf-8'
-        except UnicodeDecodeError:
+
+        # UTF-8校验在遇到第一个非法字节时即终止，其次尝试GBK
+        # （gb2312是GBK的子集，无需单独尝试）
+        for encoding in ('utf-8', 'gbk'):
             try:
-                data.decode('gbk')
-                return 'gbk'
+                data.decode(encoding)
+                return encoding
             except UnicodeDecodeError:
-                return 'latin1'
+                pass
+
+        return 'latin1'
 
     return 'utf-8'
 
@@ -183,11 +226,8 @@ def clean_text_for_display(text, max_length=100):
     if text is None:
         return "(空值)"
 
-    # 修复乱码
-    cleaned_text = fix_garbled_text(str(text))
-
-    # 修复特殊字符（包括书名号）
-    cleaned_text = fix_special_chars_for_display(cleaned_text)
+    # 修复乱码和特殊字符（包括书名号）
+    cleaned_text = fix_text_for_display(str(text))
 
     # 限制长度
     if len(cleaned_text) > max_length:
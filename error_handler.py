@@ -11,11 +11,18 @@
 """
 
 import logging
-import traceback
+import re
+import functools
 from typing import Dict, List, Optional, Any
 from enum import Enum
 from dataclasses import dataclass
 
+# 可选：Hyperscan多模式DFA引擎，不可用时回退到re
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 
 class ErrorSeverity(Enum):
     """错误严重程度"""
@@ -40,9 +47,27 @@ class ErrorCategory(Enum):
     UNKNOWN_ERROR = "unknown_error"
 
 
-@dataclass
+def _build_hyperscan_database(patterns: List[str]):
+    """将错误模式编译为Hyperscan数据库，不可用时返回None"""
+    if hyperscan is None:
+        return None
+
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[pattern.encode('utf-8') for pattern in patterns],
+            ids=list(range(len(patterns))),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(patterns)
+        )
+        return database
+    except Exception as e:
+        logging.warning(f"Hyperscan编译错误模式失败，使用re匹配: {e}")
+        return None
+
+
+@dataclass(slots=True, frozen=True)
 class ErrorInfo:
-    """错误信息类"""
+    """错误信息类（不可变，可作为字典键去重）"""
     message: str
     category: ErrorCategory
     severity: ErrorSeverity
@@ -77,6 +102,15 @@ class ErrorHandler:
         'info': '信息'
     }
 
+    # 错误严重程度对应的日志级别
+    LOG_LEVEL_MAP = {
+        ErrorSeverity.CRITICAL: logging.CRITICAL,
+        ErrorSeverity.HIGH: logging.ERROR,
+        ErrorSeverity.MEDIUM: logging.WARNING,
+        ErrorSeverity.LOW: logging.INFO,
+        ErrorSeverity.INFO: logging.INFO
+    }
+
     # 常见错误模式和建议
     ERROR_PATTERNS = {
         # 文件相关错误
@@ -140,30 +174,64 @@ class ErrorHandler:
         }
     }
 
+    # 与ERROR_PATTERNS顺序一致的错误信息模板，分类时只需替换message
+    _PATTERN_TEMPLATES = tuple(
+        ErrorInfo("", error_config['category'], error_config['severity'], error_config['suggestion'])
+        for error_config in ERROR_PATTERNS.values()
+    )
+    _UNKNOWN_TEMPLATE = ErrorInfo("", ErrorCategory.UNKNOWN_ERROR, ErrorSeverity.MEDIUM,
+                                  "未知错误，请查看详细日志或联系技术支持")
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _compiled_matcher(cls):
+        """
+        编译错误模式匹配器，首次分类错误时才执行，不占用模块导入时间
+
+        Returns:
+            (Hyperscan数据库, 融合正则)，二者只有一个不为None
+        """
+        # Hyperscan数据库（可选），一次扫描同时匹配全部模式
+        database = _build_hyperscan_database(list(cls.ERROR_PATTERNS))
+        if database is not None:
+            return database, None
+
+        # 融合为单个正则：每个分支是一个前瞻，在位置0按顺序尝试，
+        # 因此命中的总是ERROR_PATTERNS中排在最前面的模式
+        fused_pattern = re.compile(
+            '|'.join(f'(?=(?s:.*?)(?P<g{i}>{pattern}))'
+                     for i, pattern in enumerate(cls.ERROR_PATTERNS)),
+            re.IGNORECASE
+        )
+        return None, fused_pattern
+
+    @classmethod
+    @functools.lru_cache(maxsize=2048)
+    def _match_pattern(cls, error_message: str) -> int:
+        """返回第一个命中的错误模式序号，未命中返回-1（按消息缓存）"""
+        database, fused_pattern = cls._compiled_matcher()
+        if database is not None:
+            matched_ids = []
+
+            def on_match(pattern_id, start, end, flags, context):
+                matched_ids.append(pattern_id)
+
+            database.scan(error_message.encode('utf-8'), match_event_handler=on_match)
+            # 多个模式命中时取声明顺序最靠前的一个
+            return min(matched_ids) if matched_ids else -1
+
+        match = fused_pattern.match(error_message)
+        return int(match.lastgroup[1:]) if match else -1
+
     @classmethod
     def classify_error(cls, error_message: str) -> ErrorInfo:
         """分类错误信息"""
-        import re
-
         error_message = str(error_message)
 
-        # 匹配错误模式
-        for pattern, error_config in cls.ERROR_PATTERNS.items():
-            if re.search(pattern, error_message, re.IGNORECASE):
-                return ErrorInfo(
-                    message=error_message,
-                    category=error_config['category'],
-                    severity=error_config['severity'],
-                    suggestion=error_config['suggestion']
-                )
-
-        # 默认错误分类
-        return ErrorInfo(
-            message=error_message,
-            category=ErrorCategory.UNKNOWN_ERROR,
-            severity=ErrorSeverity.MEDIUM,
-            suggestion="未知错误，请查看详细日志或联系技术支持"
-        )
+        # 单次扫描匹配所有错误模式，未命中时使用默认错误分类
+        index = cls._match_pattern(error_message)
+        template = cls._PATTERN_TEMPLATES[index] if index >= 0 else cls._UNKNOWN_TEMPLATE
+        return ErrorInfo(error_message, template.category, template.severity, template.suggestion)
 
     @classmethod
     def get_user_friendly_message(cls, error_message: str, file_name: str = "") -> str:
@@ -199,29 +267,28 @@ class ErrorHandler:
         """记录错误日志"""
         error_info = cls.classify_error(str(error))
 
-        # 构建日志消息
-        log_message = f"错误发生 - 类别: {error_info.category.value}, 严重程度: {error_info.severity.value}"
-        if context:
-            log_message += f", 上下文: {context}"
-        if file_name:
-            log_message += f", 文件: {file_name}"
-
-        log_message += f"\n错误信息: {error_info.message}"
-        log_message += f"\n解决建议: {error_info.suggestion}"
-
-        # 根据严重程度选择日志级别
-        if error_info.severity == ErrorSeverity.CRITICAL:
-            logging.critical(log_message)
-        elif error_info.severity == ErrorSeverity.HIGH:
-            logging.error(log_message)
-        elif error_info.severity == ErrorSeverity.MEDIUM:
-            logging.warning(log_message)
-        else:
-            logging.info(log_message)
+        # 根据严重程度选择日志级别，级别未启用时不做任何格式化
+        level = cls.LOG_LEVEL_MAP.get(error_info.severity, logging.INFO)
+        root_logger = logging.getLogger()
+        if root_logger.isEnabledFor(level):
+            # 构建日志消息模板，参数由logging在真正输出时再格式化
+            log_format = "错误发生 - 类别: %s, 严重程度: %s"
+            log_args = [error_info.category.value, error_info.severity.value]
+            if context:
+                log_format += ", 上下文: %s"
+                log_args.append(context)
+            if file_name:
+                log_format += ", 文件: %s"
+                log_args.append(file_name)
+
+            log_format += "\n错误信息: %s\n解决建议: %s"
+            log_args.extend((error_info.message, error_info.suggestion))
+            logging.log(level, log_format, *log_args)
 
         # 记录详细堆栈信息（仅在调试模式下）
-        if logging.getLogger().isEnabledFor(logging.DEBUG):
-            logging.debug(f"详细堆栈信息:\n{traceback.format_exc()}")
+        if root_logger.isEnabledFor(logging.DEBUG):
+            import traceback
+            logging.debug("详细堆栈信息:\n%s", traceback.format_exc())
 
     @classmethod
     def create_error_report(cls, errors: List[Exception], context: str = "") -> Dict[str, Any]:
@@ -233,6 +300,9 @@ class ErrorHandler:
             'errors': []
         }
 
+        # 相同的错误只保留一条详情，并记录出现次数
+        unique_errors = {}
+
         for error in errors:
             error_info = cls.classify_error(str(error))
 
@@ -244,12 +314,16 @@ class ErrorHandler:
             severity = error_info.severity.value
             error_summary['error_severities'][severity] = error_summary['error_severities'].get(severity, 0) + 1
 
-            # 添加错误详情
+            unique_errors[error_info] = unique_errors.get(error_info, 0) + 1
+
+        # 添加错误详情
+        for error_info, count in unique_errors.items():
             error_summary['errors'].append({
                 'message': error_info.message,
-                'category': category,
-                'severity': severity,
-                'suggestion': error_info.suggestion
+                'category': error_info.category.value,
+                'severity': error_info.severity.value,
+                'suggestion': error_info.suggestion,
+                'count': count
             })
 
         return error_summary
@@ -9,7 +9,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import pandas as pd
-import geopandas as gpd
+import pyogrio
 from pathlib import Path
 import logging
 import warnings
@@ -18,7 +18,10 @@ import numpy as np
 from datetime import datetime
 import json
 import csv
-import difflib
+import functools
+import codecs
+import struct
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # 抑制编码转换警告
 warnings.filterwarnings('ignore', category=UserWarning, module='pyogrio')
@@ -29,7 +32,7 @@ warnings.filterwarnings('ignore', message='.*couldn\'t be converted correctly.*'
 
 # 导入编码修复工具
 try:
-    from encoding_fix_utils import clean_text_for_display, fix_garbled_text, fix_special_chars_for_display
+    from encoding_fix_utils import clean_text_for_display, fix_text_for_display
 except ImportError:
     # 如果导入失败，使用简单的替代函数
     def clean_text_for_display(text, max_length=100):
@@ -40,17 +43,44 @@ except ImportError:
             text_str = text_str[:max_length-3] + "..."
         return text_str
 
-    def fix_garbled_text(text):
-        return str(text)
-
-    def fix_special_chars_for_display(text):
+    def fix_text_for_display(text):
         return str(text)
 
 logger = logging.getLogger(__name__)
 
+# 字段值模式分析使用的预编译正则
+_NUMERIC_PATTERN = re.compile(r'^-?\d+(\.\d+)?$')
+_DATE_PATTERN = re.compile(r'\d{4}[-/]\d{1,2}[-/]\d{1,2}')
+_CODE_PATTERN = re.compile(r'^[A-Za-z]+-\d+$')
+
+
+@functools.lru_cache(maxsize=256)
+def _get_replace_pattern(find_text, case_sensitive, whole_word):
+    """批量替换使用的正则（按查找文本和选项缓存，重复替换时不再编译）"""
+    flags = 0 if case_sensitive else re.IGNORECASE
+    if whole_word:
+        return re.compile(r'\b' + re.escape(find_text) + r'\b', flags)
+    return re.compile(re.escape(find_text), flags)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_all_standards():
+    """加载字段标准表（每个进程只加载一次）"""
+    try:
+        from shp_field_checker_gui import DEFAULT_FIELD_STANDARDS
+        return DEFAULT_FIELD_STANDARDS
+    except ImportError:
+        return {}
+
+
 class FieldEditorDialog:
     """字段编辑弹窗"""
 
+    # 表格分批插入时每批的行数
+    RENDER_BATCH_SIZE = 2000
+    # 分页读取文件时每页的要素数
+    LOAD_CHUNK_SIZE = 50000
+
     def __init__(self, parent, file_path, field_name, layer_name=None):
         """
         初始化字段编辑弹窗
@@ -70,7 +100,26 @@ class FieldEditorDialog:
         self.field_name = field_name
         self.layer_name = layer_name
         self.original_data = None
-        self.modified_data = None
+        # 当前字段的原始值与工作副本，修改只写入工作副本，保存时再写回数据
+        self._orig_column = None
+        self._field_values = None
+        self._src_encoding = None
+        # 工作副本被修改后置位，未修改时保存和关闭无需比较整列
+        self._dirty = False
+        # 工作副本或表格行每次变化时递增，用于判断搜索缓存是否失效
+        self._data_version = 0
+        self._search_cache = None
+        self.data_patterns = {}
+
+        # 后台分页加载状态
+        self._loading = False
+        self._load_generation = 0
+        self._pending_frames = []
+
+        # 文件读写在单独的工作线程中执行
+        self._io_executor = ThreadPoolExecutor(max_workers=1)
+        self._io_busy = False
+
         self.selected_items = set()
         self.search_results = []
         self.current_search_index = -1
@@ -81,6 +130,24 @@ class FieldEditorDialog:
         self.operation_count = 0
         self.repair_text = None
 
+        # 表格显示缓存（分批插入时使用）
+        self._display_values = ()
+        self._null_mask = ()
+        self._rendered_count = 0
+        self._render_after_id = None
+        self._on_render_complete = None
+
+        # 窗口大小变化防抖
+        self._resize_after_id = None
+        self._last_width = None
+
+        # 上一次的选中项，用于只更新选择变化的行
+        self._prev_selection = set()
+        # 只读文本框当前显示的内容（按控件路径），内容不变时跳过重写
+        self._text_contents = {}
+        # 待执行的统计刷新（多次修改合并为一次）
+        self._stats_after_id = None
+
         # 验证文件是否存在
         if not self.file_path.exists():
             raise FileNotFoundError(f"文件不存在: {self.file_path}")
@@ -94,6 +161,8 @@ class FieldEditorDialog:
         self.dialog.minsize(1000, 700)    # 设置最小窗口大小
         self.dialog.transient(parent)
         self.dialog.grab_set()
+        # 弹窗关闭时停止后台分页加载
+        self.dialog.bind('<Destroy>', self._on_dialog_destroy, add='+')
 
         # 设置弹窗位置为屏幕中心
         self.dialog.update_idletasks()
@@ -199,8 +268,10 @@ class FieldEditorDialog:
         self.dialog.bind('<F5>', lambda e: self.refresh_data())
 
         # 添加快捷键提示到按钮
-        ttk.Button(toolbar_frame, text="保存修改 (Ctrl+S)", command=self.save_changes).pack(side=tk.LEFT, padx=5)
-        ttk.Button(toolbar_frame, text="撤销修改 (Ctrl+Z)", command=self.revert_changes).pack(side=tk.LEFT, padx=5)
+        self.save_button = ttk.Button(toolbar_frame, text="保存修改 (Ctrl+S)", command=self.save_changes)
+        self.save_button.pack(side=tk.LEFT, padx=5)
+        self.revert_button = ttk.Button(toolbar_frame, text="撤销修改 (Ctrl+Z)", command=self.revert_changes)
+        self.revert_button.pack(side=tk.LEFT, padx=5)
         ttk.Button(toolbar_frame, text="关闭 (Ctrl+Q)", command=self.dialog.destroy).pack(side=tk.RIGHT, padx=5)
 
         # 添加导出按钮到工具栏
@@ -218,10 +289,20 @@ class FieldEditorDialog:
         self.dialog.bind('<Configure>', self.on_window_resize)
 
     def on_window_resize(self, event):
-        """窗口大小变化时的处理"""
-        if event.widget == self.dialog:
-            # 重新计算表格列宽
-            self.update_table_column_widths()
+        """窗口大小变化时的处理（拖动过程中只在停顿后重算一次列宽）"""
+        if event.widget is not self.dialog or event.width == self._last_width:
+            return
+        self._last_width = event.width
+
+        if self._resize_after_id is not None:
+            self.dialog.after_cancel(self._resize_after_id)
+        self._resize_after_id = self.dialog.after(80, self._apply_resize)
+
+    def _apply_resize(self):
+        """延迟执行的列宽重算"""
+        self._resize_after_id = None
+        # 重新计算表格列宽
+        self.update_table_column_widths()
 
     def update_table_column_widths(self):
         """更新表格列宽以适应窗口大小"""
@@ -293,39 +374,89 @@ class FieldEditorDialog:
         self.create_context_menu()
 
     def load_data(self):
-        """加载数据时分析模式"""
+        """加载数据（文件读取在工作线程执行，完成后回到主线程填充表格）"""
+        self.status_var.set("正在加载数据...")
+
+        logger.info(f"开始加载文件: {self.file_path}")
+        logger.info(f"字段名: {self.field_name}")
+
+        # 取消尚未完成的后台加载
+        self._load_generation += 1
+        self._loading = True
+        self._pending_frames = []
+        generation = self._load_generation
+
+        self._set_io_busy(True)
+        future = self._io_executor.submit(self._read_first_page)
+        self._poll_future(future, lambda f: self._on_first_page_loaded(f, generation))
+
+    def _read_first_page(self):
+        """读取第一页数据（工作线程），只读取当前字段，不加载几何"""
+        page_size = self.LOAD_CHUNK_SIZE
+
+        if self.file_path.suffix.lower() == '.gdb':
+            logger.info("正在读取GDB文件...")
+            data = self._read_source(columns=[self.field_name], read_geometry=False,
+                                     max_features=page_size)
+            success_encoding = None
+        else:
+            # SHP/DBF文件 - 有.cpg声明时优先使用声明的编码，否则优先使用GBK编码
+            logger.info("正在读取SHP/DBF文件...")
+            encodings = ['gbk', 'utf-8', 'gb2312', 'cp936']
+            declared_encoding = self._read_cpg_encoding()
+            if declared_encoding:
+                encodings = [declared_encoding] + [e for e in encodings if e != declared_encoding]
+            data = None
+            success_encoding = None
+
+            for encoding in encodings:
+                try:
+                    data = self._read_source(columns=[self.field_name], read_geometry=False,
+                                             encoding=encoding, max_features=page_size)
+                    success_encoding = encoding
+                    logger.info(f"成功使用编码 {encoding} 读取文件")
+                    break
+                except Exception as e:
+                    logger.warning(f"使用编码 {encoding} 读取失败: {e}")
+                    continue
+
+        if data is None:
+            raise ValueError("无法读取文件")
+
+        return data, success_encoding, self._count_features()
+
+    def _read_cpg_encoding(self):
+        """读取.cpg文件中声明的编码，不存在或无法识别时返回None"""
+        cpg_path = self.file_path.with_suffix('.cpg')
+        if not cpg_path.exists():
+            return None
         try:
-            self.status_var.set("正在加载数据...")
-            self.dialog.update()
+            declared = cpg_path.read_text(encoding='ascii', errors='ignore').strip()
+        except OSError as e:
+            logger.warning(f"读取编码声明文件失败: {e}")
+            return None
+        # ArcGIS常写入代码页编号
+        if declared.isdigit():
+            declared = {'936': 'gbk', '65001': 'utf-8'}.get(declared, f'cp{declared}')
+        try:
+            return codecs.lookup(declared).name
+        except LookupError:
+            logger.warning(f"无法识别的编码声明: {declared}")
+            return None
+
+    def _on_first_page_loaded(self, future, generation):
+        """第一页读取完成（主线程），填充表格，其余页在后台读取"""
+        if generation != self._load_generation:
+            return
+        self._set_io_busy(False)
 
-            logger.info(f"开始加载文件: {self.file_path}")
-            logger.info(f"字段名: {self.field_name}")
+        try:
+            data, success_encoding, total_count = future.result()
+            self._loading = False
+            self._src_encoding = success_encoding
+            page_size = self.LOAD_CHUNK_SIZE
 
-            # 读取文件
-            if self.file_path.suffix.lower() == '.gdb':
-                logger.info("正在读取GDB文件...")
-                data = gpd.read_file(self.file_path, driver='OpenFileGDB')
-            else:
-                # SHP/DBF文件 - 优先使用GBK编码
-                logger.info("正在读取SHP/DBF文件...")
-                encodings = ['gbk', 'utf-8', 'gb2312', 'cp936']
-                data = None
-                success_encoding = None
-
-                for encoding in encodings:
-                    try:
-                        data = gpd.read_file(self.file_path, encoding=encoding)
-                        success_encoding = encoding
-                        logger.info(f"成功使用编码 {encoding} 读取文件")
-                        break
-                    except Exception as e:
-                        logger.warning(f"使用编码 {encoding} 读取失败: {e}")
-                        continue
-
-            if data is None:
-                raise ValueError("无法读取文件")
-
-            logger.info(f"文件读取成功，总行数: {len(data)}")
+            logger.info(f"文件读取成功，总行数: {total_count}")
             logger.info(f"所有列: {list(data.columns)}")
 
             # 检查字段是否存在
@@ -339,49 +470,180 @@ class FieldEditorDialog:
 
             # 保存原始数据
             self.original_data = data
-            self.modified_data = data.copy()
-
-            # 更新表格显示
-            self.populate_table(field_data)
+            self._orig_column = field_data.to_numpy(dtype=object, copy=True)
+            self._field_values = self._orig_column.copy()
+            self._dirty = False
 
-            # 立即分析数据模式
-            self.analyze_data_patterns()
+            # 更新表格显示，全部页读取且全部行插入后分析数据模式
+            def on_table_ready():
+                self.analyze_data_patterns()
+                self.status_var.set(f"已加载 {len(self._field_values)} 条记录")
 
-            self.status_var.set(f"已加载 {len(field_data)} 条记录")
+            if len(field_data) >= page_size and (total_count < 0 or total_count > len(field_data)):
+                self._start_background_load(len(field_data), total_count)
+            self.populate_table(field_data, on_complete=on_table_ready)
 
         except Exception as e:
+            self._loading = False
             logger.error(f"加载数据时出错: {e}", exc_info=True)
             messagebox.showerror("错误", f"加载数据失败: {str(e)}")
             self.dialog.destroy()
 
-    def populate_table(self, field_data):
-        """填充表格数据"""
+    def _poll_future(self, future, callback, interval=50):
+        """在主线程中轮询工作线程结果，完成后调用callback(future)"""
         try:
-            # 清空现有数据
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-
-            # 记录填充的数据
-            filled_count = 0
-            null_count = 0
-
-            # 填充数据
-            for idx, value in enumerate(field_data, 1):
-                is_null = pd.isna(value) or (isinstance(value, str) and not value.strip())
-                display_value = "" if is_null else str(value).strip()
-
-                item = self.tree.insert('', 'end', values=(
-                    idx,
-                    display_value,
-                    '是' if is_null else '否'
-                ))
-
-                # 设置标签
-                if is_null:
-                    self.tree.item(item, tags=('need_fix',))
-                    null_count += 1
-                else:
-                    filled_count += 1
+            if not self.dialog.winfo_exists():
+                return
+        except tk.TclError:
+            return
+        if future.done():
+            callback(future)
+        else:
+            self.dialog.after(interval, self._poll_future, future, callback, interval)
+
+    def _set_io_busy(self, busy):
+        """文件读写期间禁用保存和撤销按钮"""
+        self._io_busy = busy
+        state = ['disabled'] if busy else ['!disabled']
+        self.save_button.state(state)
+        self.revert_button.state(state)
+
+    def _count_features(self):
+        """读取图层要素总数"""
+        kwargs = {}
+        if self.layer_name:
+            kwargs['layer'] = self.layer_name
+        try:
+            return pyogrio.read_info(str(self.file_path), **kwargs)['features']
+        except Exception as e:
+            logger.warning(f"读取要素数量失败: {e}")
+            return -1
+
+    def _start_background_load(self, offset, total_count):
+        """分页读取剩余要素：每页在IO工作线程中读取，主线程轮询到结果后追加并提交下一页"""
+        self._loading = True
+        self._read_next_page(self._load_generation, offset, total_count)
+
+    def _read_next_page(self, generation, skip, total_count):
+        """提交从skip开始的一页读取任务（主线程）"""
+        future = self._io_executor.submit(self._read_source, columns=[self.field_name], read_geometry=False,
+                                          encoding=self._src_encoding, skip_features=skip,
+                                          max_features=self.LOAD_CHUNK_SIZE)
+        self._poll_future(future, lambda f: self._on_page_loaded(f, generation, skip, total_count))
+
+    def _on_page_loaded(self, future, generation, skip, total_count):
+        """一页读取完成（主线程），追加后继续读取下一页"""
+        if generation != self._load_generation:
+            # 加载已取消或弹窗已关闭
+            return
+
+        try:
+            page = future.result()
+        except Exception as e:
+            logger.error(f"后台加载数据时出错: {e}", exc_info=True)
+            self._finish_background_load(generation, e)
+            return
+
+        if len(page) > 0:
+            self._append_page(generation, page, total_count)
+        if len(page) < self.LOAD_CHUNK_SIZE:
+            self._finish_background_load(generation, None)
+            return
+        self._read_next_page(generation, skip + len(page), total_count)
+
+    def _on_dialog_destroy(self, event):
+        """弹窗销毁时停止后台分页加载并关闭文件读写线程
+
+        已在读取的页读完后直接丢弃；正在进行的保存会执行完，排队的任务被取消。
+        """
+        if event.widget is self.dialog:
+            self._load_generation += 1
+            self._loading = False
+            self._io_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _append_page(self, generation, page, total_count):
+        """追加后台读取的一页数据（主线程）"""
+        if generation != self._load_generation:
+            return
+
+        field_data = page[self.field_name]
+        self._pending_frames.append(page)
+        page_values = field_data.to_numpy(dtype=object, copy=True)
+        self._orig_column = np.concatenate([self._orig_column, page_values])
+        self._field_values = np.concatenate([self._field_values, page_values.copy()])
+        self._data_version += 1
+
+        display_values, null_mask = self._prepare_display(field_data)
+        self._display_values = np.concatenate([self._display_values, display_values])
+        self._null_mask = np.concatenate([self._null_mask, null_mask])
+
+        # 已插入的行追上缓存后，需要重新排队插入
+        if self._render_after_id is None:
+            self._render_after_id = self.dialog.after(1, self._render_next_batch)
+
+        total_text = f"/{total_count}" if total_count >= 0 else ""
+        self.status_var.set(f"正在加载数据... {len(self._field_values)}{total_text}")
+
+    def _finish_background_load(self, generation, error):
+        """后台加载结束（主线程）"""
+        if generation != self._load_generation:
+            return
+
+        self._loading = False
+        if self._pending_frames:
+            self.original_data = pd.concat([self.original_data] + self._pending_frames,
+                                           ignore_index=True)
+            self._pending_frames = []
+
+        if error is not None:
+            messagebox.showerror("错误", f"加载剩余数据失败: {error}")
+
+        # 表格已全部插入时立即执行完成回调
+        if self._render_after_id is None:
+            self._complete_rendering()
+
+    def _prepare_display(self, field_data):
+        """一次性计算空值掩码和显示文本
+
+        按字符串形式去重编码（1、1.0和True各自保留自己的显示文本），
+        只对唯一值去除首尾空白，重复值共享同一个显示字符串。
+        """
+        codes, uniques = pd.factorize(field_data.astype(object).astype(str))
+        # 空值编码为-1，显示为空串
+        codes[field_data.isna().to_numpy()] = -1
+        unique_text = pd.Series(uniques, dtype=object).str.strip().to_numpy(dtype=object)
+        # 末尾追加一个空串，供空值编码-1索引
+        unique_text = np.append(unique_text, '')
+        display_values = unique_text[codes]
+        null_mask = display_values == ''
+        return display_values, null_mask
+
+    def populate_table(self, field_data, on_complete=None):
+        """填充表格数据
+
+        大数据量时只同步插入首批行，其余行分批插入以保持界面响应；
+        on_complete在全部行插入完成后调用。
+        """
+        try:
+            self._cancel_rendering()
+            self._data_version += 1
+
+            # 清空现有数据（一次Tcl调用删除全部行）
+            children = self.tree.get_children()
+            if children:
+                self.tree.delete(*children)
+
+            display_values, null_mask = self._prepare_display(field_data)
+
+            null_count = int(null_mask.sum())
+            filled_count = len(null_mask) - null_count
+
+            # 首批行立即插入，其余行在事件循环空闲时分批插入
+            self._display_values = display_values
+            self._null_mask = null_mask
+            self._rendered_count = 0
+            self._on_render_complete = on_complete
+            self._render_next_batch()
 
             logger.info(f"表格填充完成 - 总行数: {len(field_data)}, 空值: {null_count}, 非空值: {filled_count}")
 
@@ -389,6 +651,69 @@ class FieldEditorDialog:
             logger.error(f"填充表格时出错: {e}", exc_info=True)
             raise
 
+    def _insert_rows(self, stop):
+        """将缓存中尚未插入的行插入到第stop行为止"""
+        start = self._rendered_count
+        display_values = self._display_values
+        null_mask = self._null_mask
+        # 直接调用Tcl的insert命令，跳过Treeview.insert逐行的选项格式化；
+        # 标签随插入一并设置，避免每行再调用一次tree.item
+        tcl_call = self.tree.tk.call
+        tree_path = str(self.tree)
+        for idx in range(start, stop):
+            is_null = null_mask[idx]
+            tcl_call(tree_path, 'insert', '', 'end',
+                     '-values', (idx + 1, display_values[idx], '是' if is_null else '否'),
+                     '-tags', ('need_fix',) if is_null else ())
+        self._rendered_count = stop
+
+    def _render_next_batch(self):
+        """插入下一批行，仍有剩余时继续排队"""
+        self._render_after_id = None
+        try:
+            if not self.tree.winfo_exists():
+                return
+        except tk.TclError:
+            return
+
+        total = len(self._display_values)
+        self._insert_rows(min(self._rendered_count + self.RENDER_BATCH_SIZE, total))
+
+        if self._rendered_count < total:
+            self._render_after_id = self.dialog.after(1, self._render_next_batch)
+        else:
+            self._complete_rendering()
+
+    def _complete_rendering(self):
+        """全部行插入完成后执行回调（后台仍在加载时等待加载完成）"""
+        if self._loading:
+            return
+        callback = self._on_render_complete
+        self._on_render_complete = None
+        if callback is not None:
+            callback()
+
+    def _cancel_rendering(self):
+        """取消尚未执行的分批插入"""
+        if self._render_after_id is not None:
+            self.dialog.after_cancel(self._render_after_id)
+            self._render_after_id = None
+        self._on_render_complete = None
+
+    def _finish_rendering(self):
+        """立即插入剩余的所有行（整表操作前调用）"""
+        if self._render_after_id is None:
+            return
+        self.dialog.after_cancel(self._render_after_id)
+        self._render_after_id = None
+        self._insert_rows(len(self._display_values))
+        self._complete_rendering()
+
+    def _all_items(self):
+        """返回表格全部行，必要时先补齐尚未插入的行"""
+        self._finish_rendering()
+        return self.tree.get_children()
+
     def on_double_click(self, event):
         """双击编辑"""
         item = self.tree.selection()[0]
@@ -421,8 +746,7 @@ class FieldEditorDialog:
         # 修复显示值中的乱码和特殊字符
         display_value = current_value if current_value != "(空值)" else ""
         if display_value:
-            display_value = fix_garbled_text(display_value)
-            display_value = fix_special_chars_for_display(display_value)
+            display_value = fix_text_for_display(display_value)
 
         entry_var = tk.StringVar(value=display_value)
         entry = ttk.Entry(edit_dialog, textvariable=entry_var, width=50)
@@ -444,14 +768,12 @@ class FieldEditorDialog:
 
             # 更新数据
             index = int(current_values[0]) - 1
-            if self.modified_data is not None:
-                if new_value == "":
-                    self.modified_data.loc[index, self.field_name] = None
-                else:
-                    self.modified_data.loc[index, self.field_name] = new_value
+            if self._field_values is not None:
+                self._field_values[index] = new_value if new_value != "" else None
+                self._mark_modified()
 
             # 更新标签
-            if is_null:
+            if is_null == "是":
                 self.tree.item(item, tags=('need_fix',))
             else:
                 self.tree.item(item, tags=('fixed',))
@@ -488,11 +810,12 @@ class FieldEditorDialog:
             index = int(current_values[0]) - 1
 
             # 更新表格显示
-            self.tree.item(item, values=(current_values[0], "(空值)", "是"))
+            self.tree.item(item, values=(current_values[0], "(空值)", "是"), tags=('need_fix',))
 
             # 更新数据
-            if self.modified_data is not None:
-                self.modified_data.loc[index, self.field_name] = None
+            if self._field_values is not None:
+                self._field_values[index] = None
+                self._mark_modified()
 
             self.status_var.set("已设为空值，请点击保存")
             self.record_operation('set_null')
@@ -519,80 +842,308 @@ class FieldEditorDialog:
             self.context_menu.grab_release()
 
     def save_changes(self):
-        """保存修改"""
+        """保存修改（文件读写在工作线程执行）"""
         try:
-            self.status_var.set("正在保存...")
-            self.dialog.update()
+            if self._io_busy:
+                return
+            if self._loading:
+                messagebox.showinfo("提示", "数据仍在加载中，请稍后再保存")
+                return
 
-            # 检查是否有修改
-            if self.original_data is not None and self.modified_data is not None:
-                if self.original_data.equals(self.modified_data):
-                    messagebox.showinfo("提示", "没有修改需要保存")
-                    return
+            # 检查是否有修改（先看修改标记，再核对一次数据）
+            if self.original_data is not None and not self.has_changes():
+                self._dirty = False
+                messagebox.showinfo("提示", "没有修改需要保存")
+                return
 
-            # 保存文件
-            if self.modified_data is not None:
-                if self.file_path.suffix.lower() == '.gdb':
-                    # GDB文件保存
-                    self.modified_data.to_file(self.file_path, driver='OpenFileGDB')
-                else:
-                    # SHP/DBF文件保存 - 尝试多种编码
-                    save_success = False
-                    save_errors = []
-
-                    # 尝试UTF-8编码
-                    try:
-                        self.modified_data.to_file(self.file_path, encoding='utf-8')
-                        save_success = True
-                        logger.info("使用UTF-8编码保存成功")
-                    except Exception as e:
-                        save_errors.append(f"UTF-8保存失败: {e}")
-
-                    # 如果UTF-8失败，尝试GBK编码
-                    if not save_success:
-                        try:
-                            self.modified_data.to_file(self.file_path, encoding='gbk')
-                            save_success = True
-                            logger.info("使用GBK编码保存成功")
-                        except Exception as e:
-                            save_errors.append(f"GBK保存失败: {e}")
+            # 确认修改后的值能用源编码保存，避免GDAL转换时静默替换字符
+            encoding = self._src_encoding or 'utf-8'
+            if self.file_path.suffix.lower() != '.gdb':
+                bad_rows = self._find_unencodable_rows(encoding)
+                if bad_rows:
+                    row_text = ', '.join(str(row) for row in bad_rows[:10])
+                    if len(bad_rows) > 10:
+                        row_text += ' ...'
+                    if not messagebox.askyesno(
+                            "编码提示",
+                            f"第 {row_text} 行包含无法用 {encoding} 编码保存的字符。\n"
+                            f"是否改用 UTF-8 编码保存？"):
+                        self.status_var.set("已取消保存")
+                        return
+                    encoding = 'utf-8'
 
-                    # 如果GBK也失败，尝试使用错误处理
-                    if not save_success:
-                        try:
-                            self.modified_data.to_file(self.file_path, encoding='gbk', errors='replace')
-                            save_success = True
-                            logger.warning("使用GBK编码（错误替换模式）保存成功")
-                        except Exception as e:
-                            save_errors.append(f"GBK错误替换保存失败: {e}")
+            self.status_var.set("正在保存...")
+
+            # 保存期间仍可继续编辑，写入的是此刻的快照
+            values = self._field_values.copy()
+            self._set_io_busy(True)
+            future = self._io_executor.submit(self._write_file, values, encoding)
+            self._poll_future(future, lambda f: self._on_save_done(f, values, encoding))
 
-                    if not save_success:
-                        raise Exception(f"所有保存方式都失败: {'; '.join(save_errors)}")
+        except Exception as e:
+            messagebox.showerror("错误", f"保存失败: {str(e)}")
+            logger.error(f"保存失败: {e}")
+            self.status_var.set("保存失败")
 
-                self.status_var.set("保存成功")
-                messagebox.showinfo("成功", "修改已保存到原文件")
+    def _write_file(self, values, encoding):
+        """写入原文件（工作线程）
+
+        SHP/DBF且编码未变时优先只改写.dbf中变化行的该字段，不重写几何；
+        无法原地写入时生成完整数据并重写整个文件。
+        """
+        if (self.file_path.suffix.lower() != '.gdb' and encoding == self._src_encoding
+                and self._write_dbf_in_place(values, encoding)):
+            logger.info(f"已原地更新.dbf中的字段 {self.field_name}")
+            return pd.DataFrame({self.field_name: self._typed_column(values)})
+
+        modified_data = self._build_modified_data(values)
+        if self.file_path.suffix.lower() == '.gdb':
+            # GDB文件保存
+            modified_data.to_file(self.file_path, driver='OpenFileGDB')
+        else:
+            # SHP/DBF文件保存 - 使用读取时的编码
+            modified_data.to_file(self.file_path, encoding=encoding)
+            logger.info(f"使用{encoding}编码保存成功")
+        return modified_data
 
-                # 更新原始数据
-                if self.modified_data is not None:
-                    self.original_data = self.modified_data.copy()
+    def _write_dbf_in_place(self, values, encoding):
+        """只把变化行的当前字段写回.dbf（工作线程），无法安全原地写入时返回False
 
+        支持字符型(C)和数值型(N/F)字段；值超出字段宽度、存在已删除记录、
+        记录数与数据不一致等情况都退回完整重写。所有值先编码校验，再统一写入。
+        """
+        dbf_path = self.file_path.with_suffix('.dbf')
+        if not dbf_path.exists():
+            return False
+        rows = self._changed_rows(values)
+        try:
+            with open(dbf_path, 'rb') as f:
+                header = f.read(32)
+                record_count, header_length, record_length = struct.unpack('<IHH', header[4:12])
+                descriptors = f.read(header_length - 32)
+            # 只处理dBase III格式（GDAL/ArcGIS写出的格式）
+            if header[0] not in (0x03, 0x83) or record_count != len(values):
+                return False
+
+            # 查找字段描述（每个32字节，以0x0D结束），记录首字节为删除标记
+            offset = 1
+            field_type = None
+            for start in range(0, len(descriptors) - 31, 32):
+                descriptor = descriptors[start:start + 32]
+                if descriptor[0] == 0x0D:
+                    break
+                name = descriptor[:11].split(b'\x00')[0].decode(encoding, errors='replace')
+                if name == self.field_name:
+                    field_type = chr(descriptor[11])
+                    width, decimals = descriptor[16], descriptor[17]
+                    break
+                offset += descriptor[16]
+            if field_type not in ('C', 'N', 'F'):
+                return False
+
+            # 已删除的记录读取时会被跳过，行号与记录号不再对应
+            if record_count:
+                records = np.memmap(dbf_path, dtype=np.uint8, mode='r', offset=header_length,
+                                    shape=(record_count, record_length))
+                has_deleted = bool((records[:, 0] == ord('*')).any())
+                del records
+                if has_deleted:
+                    return False
+
+            encoded = []
+            for row in rows:
+                value = values[row]
+                if field_type == 'C':
+                    raw = b'' if pd.isna(value) else str(value).encode(encoding)
+                    if len(raw) > width:
+                        return False
+                    raw = raw.ljust(width, b' ')
+                elif pd.isna(value) or str(value).strip() == '':
+                    raw = b'*' * width
+                else:
+                    number = float(value)
+                    text = f"{number:{width}.{decimals}f}" if decimals else f"{round(number):{width}d}"
+                    if len(text) > width:
+                        return False
+                    raw = text.encode('ascii')
+                encoded.append((row, raw))
+        except (OSError, ValueError, UnicodeError, struct.error) as e:
+            logger.warning(f"无法原地写入.dbf，改为完整保存: {e}")
+            return False
+
+        with open(dbf_path, 'r+b') as f:
+            for row, raw in encoded:
+                f.seek(header_length + row * record_length + offset)
+                f.write(raw)
+        return True
+
+    def _on_save_done(self, future, values, encoding):
+        """保存完成（主线程）"""
+        self._set_io_busy(False)
+        try:
+            modified_data = future.result()
         except Exception as e:
             messagebox.showerror("错误", f"保存失败: {str(e)}")
             logger.error(f"保存失败: {e}")
             self.status_var.set("保存失败")
+            return
+
+        if self.file_path.suffix.lower() != '.gdb':
+            self._src_encoding = encoding
+
+        self.status_var.set("保存成功")
+        messagebox.showinfo("成功", "修改已保存到原文件")
+
+        # 更新原始数据
+        self.original_data = modified_data[[self.field_name]]
+        self._orig_column = values
+        # 保存期间若有新的修改则保持修改标记
+        self._dirty = self.has_changes()
+
+    def _mark_modified(self):
+        """标记工作副本已修改，并使搜索缓存失效"""
+        self._dirty = True
+        self._data_version += 1
+
+    def _display_series(self):
+        """字段工作副本的显示文本（空值为空串，其余去除首尾空白）"""
+        column = pd.Series(self._field_values if self._field_values is not None else [], dtype=object)
+        return column.where(column.notna(), '').astype(str).str.strip()
+
+    def _null_items(self):
+        """返回所有空值行（按need_fix标签一次查询，不逐行读取）"""
+        self._finish_rendering()
+        return self.tree.tag_has('need_fix')
+
+    def _mark_null_state(self, item, is_null):
+        """同步行的空值标记和标签，保证need_fix标签只出现在空值行上"""
+        self.tree.set(item, 'is_null', '是' if is_null else '否')
+        self.tree.item(item, tags=('need_fix',) if is_null else ('fixed',))
+
+    def _set_row_value(self, item, value, row=None):
+        """一次Tcl调用更新行的值、空值标记和标签，并同步到字段工作副本
+
+        row为行的当前数据（tree.item的values元组或tree.set返回的字典），
+        调用方已读取时传入可省去一次读取；校验状态列原样保留。
+        """
+        if row is None:
+            row = self.tree.item(item, 'values')
+        elif isinstance(row, dict):
+            row = tuple(row.get(column, '') for column in self.tree['columns'])
+        index = int(row[0])
+        status = row[3] if len(row) > 3 else ''
+        is_null = value == ''
+        self.tree.item(item, values=(index, value, '是' if is_null else '否', status),
+                       tags=('need_fix',) if is_null else ('fixed',))
+        if self._field_values is not None:
+            self._field_values[index - 1] = None if is_null else value
+            self._mark_modified()
+
+    def _fill_rows(self, items, value):
+        """用同一个非空值填充多行：每行一次Tcl调用，工作副本一次批量写入"""
+        indices = []
+        for item in items:
+            row = self.tree.item(item, 'values')
+            index = int(row[0])
+            status = row[3] if len(row) > 3 else ''
+            self.tree.item(item, values=(index, value, '否', status), tags=('fixed',))
+            indices.append(index - 1)
+        if self._field_values is not None and indices:
+            self._field_values[indices] = value
+            self._mark_modified()
+
+    def _store_value(self, item, value):
+        """将表格行的新值写入字段工作副本"""
+        if self._field_values is not None:
+            self._field_values[int(self.tree.set(item, 'index')) - 1] = value if value != '' else None
+            self._mark_modified()
+
+    def _read_source(self, columns=None, read_geometry=True, encoding=None, **kwargs):
+        """使用pyogrio读取源文件，可只读取指定字段且跳过几何"""
+        if self.layer_name:
+            kwargs['layer'] = self.layer_name
+        if encoding:
+            kwargs['encoding'] = encoding
+        return pyogrio.read_dataframe(str(self.file_path), columns=columns,
+                                      read_geometry=read_geometry, **kwargs)
+
+    def _find_unencodable_rows(self, encoding):
+        """返回当前字段中无法用指定编码保存的行号（从1开始）"""
+        if self._field_values is None:
+            return []
+        strings = [value if isinstance(value, str) else '' for value in self._field_values]
+        # 整列一次编码成功时无需逐行检查
+        try:
+            '\n'.join(strings).encode(encoding)
+            return []
+        except UnicodeEncodeError:
+            pass
+
+        bad_rows = []
+        for row, value in enumerate(strings, 1):
+            try:
+                value.encode(encoding)
+            except UnicodeEncodeError:
+                bad_rows.append(row)
+        return bad_rows
+
+    def has_changes(self):
+        """字段工作副本是否与原始值不同（只比较当前字段）"""
+        if not self._dirty or self._orig_column is None or self._field_values is None:
+            return False
+        return self._changed_rows().size > 0
+
+    def _changed_rows(self, values=None):
+        """返回与原始值不同的行位置（从0开始），values默认为当前字段工作副本"""
+        if values is None:
+            values = self._field_values
+        orig_null = pd.isna(self._orig_column)
+        new_null = pd.isna(values)
+        changed = orig_null != new_null
+        both = ~(orig_null | new_null)
+        changed[both] = self._orig_column[both] != values[both]
+        return np.flatnonzero(changed)
+
+    def _build_modified_data(self, values=None):
+        """生成写回字段值后的完整数据
+
+        加载时只读取了当前字段，保存时才读取完整数据（含几何）并替换该字段列。
+        values默认为当前字段工作副本。
+        """
+        if values is None:
+            values = self._field_values
+        if self.original_data is None or values is None:
+            return None
+        modified_data = self._read_source(encoding=self._src_encoding)
+        modified_data[self.field_name] = self._typed_column(values, modified_data.index)
+        return modified_data
+
+    def _typed_column(self, values, index=None):
+        """把字段值转换为列，尽量保持原字段类型，无法转换时保留object"""
+        column = pd.Series(values, index=index, name=self.field_name)
+        original_dtype = self.original_data[self.field_name].dtype
+        if original_dtype != object:
+            try:
+                column = column.astype(original_dtype)
+            except (ValueError, TypeError):
+                pass
+        return column
 
     def revert_changes(self):
         """撤销修改"""
+        if self._io_busy:
+            return
         if messagebox.askyesno("确认", "确定要撤销所有修改吗？"):
-            if self.original_data is not None:
-                self.modified_data = self.original_data.copy()
-                self.populate_table(self.modified_data[self.field_name])
+            if self._orig_column is not None:
+                self._field_values = self._orig_column.copy()
+                self._dirty = False
+                self.populate_table(pd.Series(self._field_values, dtype=object))
                 self.status_var.set("已撤销修改")
 
     def run(self):
         """运行弹窗"""
         self.dialog.wait_window()
-        return self.modified_data is not None and self.original_data is not None and not self.original_data.equals(self.modified_data)
+        return self.has_changes()
 
     def batch_edit(self):
         """批量编辑对话框"""
@@ -623,23 +1174,27 @@ class FieldEditorDialog:
                 messagebox.showwarning("警告", "请先选择要编辑的项")
                 return
 
-            for item in selected:
-                old_value = self.tree.item(item)['values'][1]
-                if old_value is None or pd.isna(old_value):
-                    old_value = ""
+            # 按列数组整体计算新值
+            indices = np.array([int(self.tree.set(item, 'index')) - 1 for item in selected])
+            old_values = np.array([self.tree.set(item, 'value') for item in selected], dtype=str)
+
+            if mode == "replace":
+                new_values = np.full(len(selected), value, dtype=object)
+            elif mode == "prefix":
+                new_values = np.char.add(value, old_values).astype(object)
+            else:  # suffix
+                new_values = np.char.add(old_values, value).astype(object)
 
-                if mode == "replace":
-                    new_value = value
-                elif mode == "prefix":
-                    new_value = value + str(old_value)
-                elif mode == "suffix":
-                    new_value = str(old_value) + value
+            if self._field_values is not None:
+                self._field_values[indices] = np.where(new_values == '', None, new_values)
+                self._mark_modified()
 
+            for item, new_value in zip(selected, new_values):
                 self.tree.set(item, 'value', new_value)
-                self.tree.set(item, 'is_null', '否' if new_value else '是')
+                self._mark_null_state(item, not new_value)
 
             dialog.destroy()
-            self.update_statistics()
+            self._schedule_statistics()
             self.record_operation('batch_edit')
 
         ttk.Button(dialog, text="应用", command=apply_batch_edit).pack(pady=10)
@@ -653,35 +1208,38 @@ class FieldEditorDialog:
         else:
             field_type = self.original_data[self.field_name].dtype if self.field_name in self.original_data else None
 
-        # 验证规则
-        rules = {
-            'object': lambda x: isinstance(x, str) and bool(x.strip()),  # 非空字符串
-            'int64': lambda x: pd.notna(x) and float(x).is_integer(),   # 整数
-            'float64': lambda x: pd.notna(x) and isinstance(float(x), float),  # 浮点数
-            'datetime64[ns]': lambda x: pd.notna(x) and pd.to_datetime(x, errors='coerce') is not pd.NaT  # 日期
-        }
+        # 对整列一次性计算验证结果
+        items = self._all_items()
+        if self._field_values is not None and len(items) == len(self._field_values):
+            # 表格行与字段工作副本一一对应时直接使用工作副本
+            column = pd.Series(self._field_values, dtype=object)
+            stripped = self._display_series()
+        else:
+            # 否则（如导入数据后或后台加载未完成）逐行读取表格中的值
+            stripped = pd.Series([self.tree.set(item, 'value') for item in items], dtype=object).str.strip()
+            column = stripped.where(stripped != '', None)
+        null_mask = stripped == ''
+
+        dtype_name = str(field_type)
+        if dtype_name == 'object':  # 非空字符串
+            valid = ~null_mask
+        elif dtype_name == 'int64':  # 整数
+            numeric = pd.to_numeric(column, errors='coerce')
+            valid = numeric.notna() & numeric.mod(1).eq(0)
+        elif dtype_name == 'float64':  # 浮点数
+            valid = pd.to_numeric(column, errors='coerce').notna()
+        elif dtype_name == 'datetime64[ns]':  # 日期
+            valid = pd.to_datetime(column, errors='coerce').notna()
+        else:
+            valid = pd.Series(False, index=column.index)
+
+        status = np.where(null_mask, '空值', np.where(valid, '有效', '无效'))
 
         # 应用验证
-        for item in self.tree.get_children():
-            item_data = self.tree.item(item)
-            values = item_data.get('values') if item_data else None
-            value = values[1] if values and len(values) > 1 else None
-            try:
-                is_null = False
-                try:
-                    is_null = bool(pd.isna(value))
-                except Exception:
-                    is_null = value is None
-                if is_null or value == '':
-                    self.tree.set(item, 'validation', '空值')
-                elif str(field_type) in rules and rules[str(field_type)](value):
-                    self.tree.set(item, 'validation', '有效')
-                else:
-                    self.tree.set(item, 'validation', '无效')
-            except:
-                self.tree.set(item, 'validation', '无效')
+        for item, item_status in zip(items, status.tolist()):
+            self.tree.set(item, 'validation', item_status)
 
-        self.update_statistics()
+        self._schedule_statistics()
         self.record_operation('validate')
 
     def quick_fill(self):
@@ -754,27 +1312,29 @@ class FieldEditorDialog:
                 if mode == "sequence":
                     start = float(start_var.get())
                     step = float(step_var.get())
-                    for i, item in enumerate(selected):
-                        value = start + i * step
-                        self.tree.set(item, 'value', str(value))
-                        self.tree.set(item, 'is_null', '否')
+                    values = (start + np.arange(len(selected)) * step).astype(str)
 
                 elif mode == "repeat":
-                    value = repeat_var.get()
-                    for item in selected:
-                        self.tree.set(item, 'value', value)
-                        self.tree.set(item, 'is_null', '否' if value else '是')
+                    values = np.full(len(selected), repeat_var.get(), dtype=object)
 
                 else:  # random
                     min_val = float(min_var.get())
                     max_val = float(max_var.get())
-                    for item in selected:
-                        value = np.random.uniform(min_val, max_val)
-                        self.tree.set(item, 'value', str(value))
-                        self.tree.set(item, 'is_null', '否')
+                    values = np.random.default_rng().uniform(min_val, max_val, size=len(selected)).astype(str)
+
+                # 一次性写入字段工作副本，再逐行更新表格显示
+                values = values.tolist()
+                if self._field_values is not None:
+                    indices = [int(self.tree.set(item, 'index')) - 1 for item in selected]
+                    self._field_values[indices] = [value if value != '' else None for value in values]
+                    self._mark_modified()
+
+                for item, value in zip(selected, values):
+                    self.tree.set(item, 'value', value)
+                    self._mark_null_state(item, not value)
 
                 dialog.destroy()
-                self.update_statistics()
+                self._schedule_statistics()
 
             except ValueError as e:
                 messagebox.showerror("错误", f"参数错误: {str(e)}")
@@ -796,13 +1356,30 @@ class FieldEditorDialog:
         self.search_results = []
         self.current_search_index = -1
 
-        # 搜索
-        for item in self.tree.get_children():
-            item_data = self.tree.item(item)
-            values = item_data.get('values') if item_data else None
-            value = values[1] if values and len(values) > 1 else None
-            if search_text.lower() in str(value).lower():
-                self.search_results.append(item)
+        # 搜索（关键字只转换一次小写）
+        needle = search_text.lower()
+        items = self._all_items()
+        if self._field_values is not None and len(items) == len(self._field_values):
+            # 表格行与字段工作副本一一对应时，对整列做一次向量化匹配
+            cache = self._search_cache
+            if cache is not None and cache[0] == self._data_version:
+                _, lowered, last_needle, last_positions = cache
+            else:
+                lowered = self._display_series().str.lower()
+                last_needle, last_positions = None, None
+            if last_needle is not None and last_needle in needle:
+                # 数据未变且关键字是在上次基础上细化，只需复查上次的匹配行
+                candidates = lowered.iloc[last_positions]
+                positions = last_positions[candidates.str.contains(needle, regex=False).to_numpy()]
+            else:
+                positions = np.flatnonzero(lowered.str.contains(needle, regex=False).to_numpy())
+            self._search_cache = (self._data_version, lowered, needle, positions)
+            self.search_results = [items[i] for i in positions]
+        else:
+            for item in items:
+                value = self.tree.set(item, 'value')
+                if needle in value.lower():
+                    self.search_results.append(item)
 
         if self.search_results:
             self.current_search_index = 0
@@ -832,16 +1409,17 @@ class FieldEditorDialog:
         if not self.search_results or self.current_search_index < 0:
             return
 
+        search_text = self.search_var.get() if self.search_var else ""
+        replace_text = self.replace_var.get() if self.replace_var else ""
+        if not search_text:
+            return
+
         item = self.search_results[self.current_search_index]
-        item_data = self.tree.item(item)
-        values = item_data.get('values') if item_data else None
-        old_value = str(values[1]) if values and len(values) > 1 else ""
-        search_text = self.search_var.get() if self.search_var and hasattr(self.search_var, "get") else ""
-        replace_text = self.replace_var.get() if self.replace_var and hasattr(self.replace_var, "get") else ""
+        values = self.tree.item(item, 'values')
+        old_value = str(values[1]) if len(values) > 1 else ""
         new_value = old_value.replace(search_text, replace_text)
 
-        self.tree.set(item, 'value', new_value)
-        self.tree.set(item, 'is_null', '否' if new_value else '是')
+        self._set_row_value(item, new_value, values)
         # 移动到下一个
         if self.current_search_index < len(self.search_results) - 1:
             self.current_search_index += 1
@@ -853,21 +1431,25 @@ class FieldEditorDialog:
         if not self.search_results:
             return
 
+        search_text = self.search_var.get() if self.search_var else ""
+        replace_text = self.replace_var.get() if self.replace_var else ""
+        if not search_text:
+            return
+
+        rows = [self.tree.item(item, 'values') for item in self.search_results]
+        old_values = pd.Series([str(values[1]) if len(values) > 1 else "" for values in rows], dtype=object)
+        # 整列一次替换；搜索不区分大小写，未实际改变的行不回写
+        new_values = old_values.str.replace(search_text, replace_text, regex=False)
+        changed = (new_values != old_values).to_numpy()
+
         count = 0
-        for item in self.search_results:
-            item_data = self.tree.item(item)
-            values = item_data.get('values') if item_data else None
-            old_value = str(values[1]) if values and len(values) > 1 else ""
-            search_text = self.search_var.get() if self.search_var and hasattr(self.search_var, "get") else ""
-            replace_text = self.replace_var.get() if self.replace_var and hasattr(self.replace_var, "get") else ""
-            new_value = old_value.replace(search_text, replace_text)
-
-            self.tree.set(item, 'value', new_value)
-            self.tree.set(item, 'is_null', '否' if new_value else '是')
-            count += 1
+        for item, values, new_value, is_changed in zip(self.search_results, rows, new_values, changed):
+            if is_changed:
+                self._set_row_value(item, new_value, values)
+                count += 1
 
         self.status_var.set(f"已替换 {count} 处")
-        self.update_statistics()
+        self._schedule_statistics()
         self.record_operation('replace_all')
 
     def export_data(self):
@@ -885,27 +1467,22 @@ class FieldEditorDialog:
             return
 
         try:
-            data = []
-            for item in self.tree.get_children():
-                values = self.tree.item(item)['values']
-                data.append({
-                    '序号': values[0],
-                    '字段值': values[1],
-                    '是否为空': values[2],
-                    '验证状态': values[3] if len(values) > 3 else ''
-                })
+            headers = ['序号', '字段值', '是否为空', '验证状态']
+            # 按行生成元组，不为每行构建字典
+            rows = ((values[0], values[1], values[2], values[3] if len(values) > 3 else '')
+                    for values in (self.tree.item(item, 'values') for item in self._all_items()))
 
             if file_path.endswith('.csv'):
                 with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=['序号', '字段值', '是否为空', '验证状态'])
-                    writer.writeheader()
-                    writer.writerows(data)
+                    writer = csv.writer(f)
+                    writer.writerow(headers)
+                    writer.writerows(rows)
 
             elif file_path.endswith('.xlsx'):
-                df = pd.DataFrame(data)
-                df.to_excel(file_path, index=False)
+                self._write_xlsx_rows(file_path, headers, rows)
 
             else:  # .json
+                data = [dict(zip(headers, row)) for row in rows]
                 with open(file_path, 'w', encoding='utf-8') as f:
                     json.dump(data, f, ensure_ascii=False, indent=2)
 
@@ -914,6 +1491,58 @@ class FieldEditorDialog:
         except Exception as e:
             messagebox.showerror("错误", f"导出失败: {str(e)}")
 
+    def _export_frame(self, export_range, include_validation):
+        """按导出范围（all/selected/non_null）构建导出数据
+
+        表格行与字段工作副本一一对应时直接从工作副本按位置取值，
+        只有验证状态需要从表格读取；否则（如导入数据后）逐行读取表格。
+        """
+        items = self._all_items()
+        columns = ["序号", "字段值", "是否为空"] + (["验证状态"] if include_validation else [])
+
+        if self._field_values is None or len(items) != len(self._field_values):
+            if export_range == "selected":
+                items = self.tree.selection()
+            elif export_range == "non_null":
+                null_items = set(self._null_items())
+                items = [item for item in items if item not in null_items]
+            rows = [self.tree.item(item, 'values') for item in items]
+            data = pd.DataFrame.from_records(
+                [tuple(values[:len(columns)]) + ('',) * (len(columns) - len(values)) for values in rows],
+                columns=columns)
+            return data
+
+        display = self._display_series().to_numpy()
+        is_null = display == ''
+        if export_range == "selected":
+            positions = np.array([int(self.tree.set(item, 'index')) - 1 for item in self.tree.selection()],
+                                 dtype=np.int64)
+        elif export_range == "non_null":
+            positions = np.flatnonzero(~is_null)
+        else:
+            positions = np.arange(len(display))
+
+        data = pd.DataFrame({
+            "序号": positions + 1,
+            "字段值": display[positions],
+            "是否为空": np.where(is_null[positions], '是', '否'),
+        })
+        if include_validation:
+            data["验证状态"] = [self.tree.set(items[position], 'validation') for position in positions]
+        return data
+
+    def _write_xlsx_rows(self, file_path, headers, rows):
+        """以openpyxl只写模式逐行写出Excel，不先构建DataFrame"""
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet('Sheet1')
+        if headers:
+            sheet.append(headers)
+        for row in rows:
+            sheet.append(row)
+        workbook.save(file_path)
+
     def import_data(self):
         """导入数据"""
         file_path = filedialog.askopenfilename(
@@ -938,47 +1567,87 @@ class FieldEditorDialog:
                 df = pd.DataFrame(data)
 
             # 清空现有数据
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-
-            # 导入新数据
-            for _, row in df.iterrows():
-                row_value = row.get('字段值', '') if row is not None and hasattr(row, 'get') else ''
-                is_null = False
-                try:
-                    is_null = bool(pd.isna(row_value))
-                except Exception:
-                    is_null = row_value is None
-                values = [
-                    row.get('序号', '') if row is not None and hasattr(row, 'get') else '',
-                    row_value,
-                    '是' if is_null else '否',
-                    row.get('验证状态', '') if row is not None and hasattr(row, 'get') else ''
-                ]
-                self.tree.insert('', 'end', values=values)
+            self._cancel_rendering()
+            self._data_version += 1
+            self._rendered_count = len(self._display_values)
+            children = self.tree.get_children()
+            if children:
+                self.tree.delete(*children)
+
+            # 导入新数据（缺少的列按空串处理，空值标记整列预先计算）
+            df = df.reindex(columns=['序号', '字段值', '验证状态'], fill_value='')
+            null_mask = df['字段值'].isna().to_numpy()
+            rows = df.itertuples(index=False, name=None)
+            tcl_call = self.tree.tk.call
+            tree_path = str(self.tree)
+            for (index, row_value, status), is_null in zip(rows, null_mask):
+                tcl_call(tree_path, 'insert', '', 'end',
+                         '-values', (index, row_value, '是' if is_null else '否', status),
+                         '-tags', ('need_fix',) if is_null else ())
+
+            # 导入的值同步到字段工作副本，模式分析、搜索和统计使用导入后的数据
+            self._sync_imported_values(df)
+            self.analyze_data_patterns()
 
             self.status_var.set(f"已从 {file_path} 导入数据")
-            self.update_statistics()
+            self._schedule_statistics()
 
         except Exception as e:
             messagebox.showerror("错误", f"导入失败: {str(e)}")
 
+    def _sync_imported_values(self, df):
+        """按序号把导入的字段值写入字段工作副本，并重建显示文本和空值掩码"""
+        if self._field_values is None:
+            return
+
+        values = self._field_values.copy()
+        positions = pd.to_numeric(df['序号'], errors='coerce').to_numpy(dtype=float) - 1
+        valid = (positions >= 0) & (positions < len(values)) & (positions == np.floor(positions))
+        if not valid.all():
+            logger.warning(f"导入数据中有 {int((~valid).sum())} 行序号无效，未同步到字段数据")
+
+        imported = df['字段值'].to_numpy(dtype=object)
+        imported = np.where(pd.isna(imported), None, imported)
+        values[positions[valid].astype(int)] = imported[valid]
+
+        self._field_values = values
+        self._display_values, self._null_mask = self._prepare_display(pd.Series(values, dtype=object))
+        self._rendered_count = len(self._display_values)
+        self._mark_modified()
+
+    def _schedule_statistics(self):
+        """合并连续的统计刷新请求，在事件循环空闲时只计算一次"""
+        if self._stats_after_id is None:
+            self._stats_after_id = self.dialog.after_idle(self._flush_statistics)
+
+    def _flush_statistics(self):
+        """执行已合并的统计刷新"""
+        self._stats_after_id = None
+        try:
+            if not self.dialog.winfo_exists():
+                return
+        except tk.TclError:
+            return
+        self.update_statistics()
+
     def update_statistics(self):
         """更新统计信息"""
         try:
-            total = len(self.tree.get_children())
-            null_count = sum(1 for item in self.tree.get_children()
-                           if self.tree.item(item)['values'][2] == '是')
-
-            # 获取所有非空值
-            values = [self.tree.item(item)['values'][1]
-                     for item in self.tree.get_children()
-                     if self.tree.item(item)['values'][2] == '否']
+            # 空值行由need_fix标签维护，无需逐行读取
+            items = self._all_items()
+            total = len(items)
+            null_items = set(self._null_items())
+            null_count = len(null_items)
 
             # 获取字段标准信息
             field_info = self.get_field_standards()
             field_type = field_info.get('字段类型', '未知') if field_info is not None else '未知'
 
+            # 只有数值/文本统计需要非空值
+            values = []
+            if field_type in ['Double', 'Integer', 'Text']:
+                values = [self.tree.set(item, 'value') for item in items if item not in null_items]
+
             # 计算统计信息
             stats = {
                 '总记录数': total,
@@ -990,60 +1659,60 @@ class FieldEditorDialog:
             # 根据字段类型添加相应的统计
             if field_type in ['Double', 'Integer']:
                 try:
-                    numeric_values = [float(v) for v in values if str(v).replace('.', '').isdigit()]
-                    if numeric_values:
+                    numeric_values = pd.to_numeric(pd.Series(values, dtype=object),
+                                                   errors='coerce').dropna().to_numpy(dtype=float)
+                    if numeric_values.size:
                         stats.update({
-                            '最小值': f"{min(numeric_values):.2f}",
-                            '最大值': f"{max(numeric_values):.2f}",
-                            '平均值': f"{sum(numeric_values)/len(numeric_values):.2f}"
+                            '最小值': f"{numeric_values.min():.2f}",
+                            '最大值': f"{numeric_values.max():.2f}",
+                            '平均值': f"{numeric_values.mean():.2f}"
                         })
                 except:
                     pass
             elif field_type == 'Text':
                 if values:
-                    lengths = [len(str(v)) for v in values]
+                    lengths = np.fromiter((len(str(v)) for v in values), dtype=np.int64, count=len(values))
                     stats.update({
-                        '最短长度': min(lengths),
-                        '最长长度': max(lengths),
-                        '平均长度': f"{sum(lengths)/len(lengths):.1f}",
-                        '唯一值数': len(set(values))
+                        '最短长度': int(lengths.min()),
+                        '最长长度': int(lengths.max()),
+                        '平均长度': f"{lengths.mean():.1f}",
+                        '唯一值数': len(pd.unique(pd.Series(values, dtype=object)))
                     })
 
             # 更新统计文本
-            self.stats_text.config(state=tk.NORMAL) if self.stats_text is not None else None
-            self.stats_text.delete('1.0', tk.END) if self.stats_text is not None else None
-            for key, value in stats.items():
-                self.stats_text.insert(tk.END, f"{key}: {value}\n")
-            self.stats_text.config(state=tk.DISABLED) if self.stats_text is not None else None
+            self._rewrite_text(self.stats_text, ''.join(f"{key}: {value}\n" for key, value in stats.items()))
 
         except Exception as e:
             logger.error(f"更新统计信息时出错: {e}", exc_info=True)
-            self.stats_text.config(state=tk.NORMAL) if self.stats_text is not None else None
-            self.stats_text.delete('1.0', tk.END) if self.stats_text is not None else None
-            self.stats_text.insert(tk.END, "统计信息生成失败") if self.stats_text is not None else None
-            self.stats_text.config(state=tk.DISABLED) if self.stats_text is not None else None
+            self._rewrite_text(self.stats_text, "统计信息生成失败")
 
     def select_all(self, event=None):
         """选择所有项"""
-        self.tree.selection_set(*self.tree.get_children())
+        self.tree.selection_set(*self._all_items())
         return 'break'  # 阻止默认行为
 
     def on_selection_change(self, event=None):
         """选择变化时更新状态栏和建议"""
-        selected = len(self.tree.selection())
+        selection = set(self.tree.selection())
         total = len(self.tree.get_children())
-        self.status_var.set(f"已选择 {selected}/{total} 项")
+        self.status_var.set(f"已选择 {len(selection)}/{total} 项")
         self.update_suggestions()
 
-        # 更新选中项的高亮
-        for item in self.tree.get_children():
-            current_tags = list(self.tree.item(item)['tags'] or ())
+        # 只更新选择状态发生变化的行的高亮
+        for item in selection - self._prev_selection:
+            current_tags = list(self.tree.item(item, 'tags') or ())
+            if 'need_fix' not in current_tags and 'fixed' not in current_tags and 'selected' not in current_tags:
+                current_tags.append('selected')
+                self.tree.item(item, tags=current_tags)
+        for item in self._prev_selection - selection:
+            # 表格重新加载后旧的行已不存在
+            if not self.tree.exists(item):
+                continue
+            current_tags = list(self.tree.item(item, 'tags') or ())
             if 'selected' in current_tags:
                 current_tags.remove('selected')
-            if item in self.tree.selection():
-                if 'need_fix' not in current_tags and 'fixed' not in current_tags:
-                    current_tags.append('selected')
-            self.tree.item(item, tags=current_tags)
+                self.tree.item(item, tags=current_tags)
+        self._prev_selection = selection
 
     def batch_edit_selected(self):
         """批量编辑选中项"""
@@ -1058,42 +1727,30 @@ class FieldEditorDialog:
             messagebox.showwarning("警告", "请先选择要验证的项")
             return
         self.validate_data()
-        return self.modified_data is not None and self.original_data is not None and not self.original_data.equals(self.modified_data)
+        return self.has_changes()
 
     def analyze_data_patterns(self):
         """分析数据模式和特征"""
         try:
             logger.info("开始分析数据模式...")
 
-            # 直接从树形视图获取数据
-            all_values = []
-            null_count = 0
-            value_counts = {}
-
-            # 收集所有值
-            for item in self.tree.get_children():
-                item_data = self.tree.item(item)
-                values = item_data.get('values') if item_data else None
-                value = values[1] if values and len(values) > 1 else None
-                is_null = values[2] == '是' if values and len(values) > 2 else False
-
-                logger.debug(f"处理行: 值={value}, 是否为空={is_null}")
-
-                if is_null:
-                    null_count += 1
-                elif value:  # 确保值不是空字符串
-                    str_value = str(value).strip()
-                    if str_value:  # 再次确保去除空格后不是空字符串
-                        all_values.append(str_value)
-                        value_counts[str_value] = value_counts.get(str_value, 0) + 1
-
-            logger.info(f"值统计: {value_counts}")
+            # 对字段工作副本整列统计
+            stripped = self._display_series()
+            null_mask = stripped == ''
+            null_count = int(null_mask.sum())
+
+            # 按出现次数降序，次数相同时保持首次出现的顺序
+            counts = stripped[~null_mask].value_counts(sort=False).sort_values(ascending=False, kind='stable')
+            # 只取前5个，不为全部不同值构建Python对象
+            sorted_values = list(zip(counts.index[:5], counts.iloc[:5].tolist()))
+
+            logger.info(f"值统计: 共 {len(counts)} 个不同值, 前5: {sorted_values}")
             logger.info(f"空值数量: {null_count}")
 
-            total_count = len(all_values) + null_count
+            total_count = len(stripped)
 
             # 如果没有任何有效值，返回空结果
-            if not value_counts:
+            if not sorted_values:
                 logger.warning("未找到任何有效值")
                 self.data_patterns = {
                     'total_count': total_count,
@@ -1103,13 +1760,10 @@ class FieldEditorDialog:
                 return
 
             # 找出最常见的值
-            sorted_values = sorted(value_counts.items(), key=lambda x: x[1], reverse=True)
-            most_common = sorted_values[0]
-            most_common_value = most_common[0]
-            most_common_count = most_common[1]
+            most_common_value, most_common_count = sorted_values[0]
 
             # 计算比例
-            non_null_count = len(all_values)
+            non_null_count = total_count - null_count
             non_null_percentage = (most_common_count / non_null_count * 100) if non_null_count > 0 else 0
 
             logger.info(f"最常见值: {most_common_value} (出现 {most_common_count} 次)")
@@ -1124,7 +1778,7 @@ class FieldEditorDialog:
                 'most_common_count': most_common_count,
                 'non_null_percentage': non_null_percentage,
                 'has_pattern': most_common_count > 1,  # 只要有重复值就认为有模式
-                'value_counts': sorted_values[:5]  # 保存前5个最常见的值
+                'value_counts': sorted_values  # 保存前5个最常见的值
             }
 
             logger.info(f"数据分析结果: {self.data_patterns}")
@@ -1142,10 +1796,7 @@ class FieldEditorDialog:
 
             if not self.data_patterns:
                 logger.warning("没有数据模式信息，无法生成建议")
-                self.suggestion_text.config(state=tk.NORMAL)
-                self.suggestion_text.delete('1.0', tk.END)
-                self.suggestion_text.insert('1.0', '暂无建议')
-                self.suggestion_text.config(state=tk.DISABLED)
+                self._rewrite_text(self.suggestion_text, '暂无建议')
                 return
 
             # 获取统计信息
@@ -1179,19 +1830,23 @@ class FieldEditorDialog:
                     suggestion = "暂无需要修复的内容"
 
             # 更新提示文本
-            self.suggestion_text.config(state=tk.NORMAL)
-            self.suggestion_text.delete('1.0', tk.END)
-            self.suggestion_text.insert('1.0', suggestion)
-            self.suggestion_text.config(state=tk.DISABLED)
+            self._rewrite_text(self.suggestion_text, suggestion)
 
             logger.info(f"生成的建议: {suggestion}")
 
         except Exception as e:
             logger.error(f"更新建议时出错: {e}", exc_info=True)
-            self.suggestion_text.config(state=tk.NORMAL)
-            self.suggestion_text.delete('1.0', tk.END)
-            self.suggestion_text.insert('1.0', '生成建议时出错')
-            self.suggestion_text.config(state=tk.DISABLED)
+            self._rewrite_text(self.suggestion_text, '生成建议时出错')
+
+    def _rewrite_text(self, widget, content):
+        """整体替换只读文本框的内容，内容未变化时不做任何Tk调用"""
+        if widget is None or self._text_contents.get(str(widget)) == content:
+            return
+        widget.config(state=tk.NORMAL)
+        widget.delete('1.0', tk.END)
+        widget.insert('1.0', content)
+        widget.config(state=tk.DISABLED)
+        self._text_contents[str(widget)] = content
 
     def record_operation(self, operation):
         """记录操作"""
@@ -1202,10 +1857,9 @@ class FieldEditorDialog:
         self.update_suggestions()
 
     def scan_similar_fields(self):
-        """扫描文件夹中的其他文件，查找相同字段的值"""
+        """扫描文件夹中的其他文件，查找相同字段的值（后台线程并行读取）"""
         try:
             self.status_var.set("正在扫描其他文件...")
-            self.dialog.update()
 
             # 获取当前文件所在文件夹
             folder_path = self.file_path.parent
@@ -1214,86 +1868,108 @@ class FieldEditorDialog:
             # 收集所有的地理数据文件
             geo_files = []
             for ext in ['.shp', '.gdb']:
-                geo_files.extend(folder_path.glob(f'*{ext}'))
+                geo_files.extend(p for p in folder_path.glob(f'*{ext}') if p.name != current_file)
 
-            # 存储找到的值
-            field_values = {}
-            value_frequencies = {}
+        except Exception as e:
+            logger.error(f"扫描文件时出错: {e}")
+            messagebox.showerror("错误", f"扫描文件时出错: {str(e)}")
+            self.status_var.set("扫描失败")
+            return
 
-            # 遍历其他文件
-            for file_path in geo_files:
-                if file_path.name == current_file:
-                    continue
+        def run_scan():
+            # 每个文件的去重非空值
+            file_values = []
+            if geo_files:
+                with ThreadPoolExecutor(max_workers=min(8, len(geo_files))) as executor:
+                    futures = {executor.submit(self._read_field_column, file_path): file_path
+                               for file_path in geo_files}
+                    for future in as_completed(futures):
+                        file_path = futures[future]
+                        try:
+                            column = future.result()
+                        except Exception as e:
+                            logger.warning(f"读取文件 {file_path} 时出错: {e}")
+                            continue
+                        if column is None:
+                            continue
 
-                try:
-                    # 读取文件
-                    if file_path.suffix.lower() == '.gdb':
-                        gdf = gpd.read_file(file_path, driver='OpenFileGDB')
-                    else:
-                        # 尝试不同编码
-                        for encoding in ['gbk', 'utf-8', 'gb2312']:
-                            try:
-                                gdf = gpd.read_file(file_path, encoding=encoding)
-                                break
-                            except UnicodeDecodeError:
-                                continue
-
-                    # 检查是否有相同字段
-                    if self.field_name in gdf.columns:
                         # 获取非空值
-                        valid_values = gdf[self.field_name].dropna().unique()
-                        for value in valid_values:
-                            if pd.notna(value) and str(value).strip():
-                                str_value = str(value)
-                                field_values[str_value] = field_values.get(str_value, 0) + 1
-
-                                # 记录来源文件
-                                if str_value not in value_frequencies:
-                                    value_frequencies[str_value] = set()
-                                value_frequencies[str_value].add(file_path.name)
+                        values = pd.Series(column.dropna().astype(str).unique(), dtype=object)
+                        values = values[values.str.strip() != '']
+                        file_values.append(pd.DataFrame({'value': values, 'file': file_path.name}))
 
-                except Exception as e:
-                    logger.warning(f"读取文件 {file_path} 时出错: {e}")
+            field_values = {}
+            value_frequencies = {}
+            if file_values:
+                combined = pd.concat(file_values, ignore_index=True)
+                # 值出现在多少个文件中
+                field_values = combined['value'].value_counts().to_dict()
+                # 记录来源文件
+                value_frequencies = combined.groupby('value')['file'].agg(set).to_dict()
+
+            return field_values, value_frequencies
+
+        # 扫描在单独的工作线程中执行，不占用文件读写线程；结果由主线程轮询取回
+        executor = ThreadPoolExecutor(max_workers=1)
+        future = executor.submit(run_scan)
+        executor.shutdown(wait=False)
+        self._poll_future(future, self._on_similar_fields_scanned)
+
+    def _read_field_column(self, file_path):
+        """只读取其他文件中的当前字段（工作线程），字段不存在时返回None"""
+        if file_path.suffix.lower() == '.gdb':
+            data = pyogrio.read_dataframe(str(file_path), columns=[self.field_name], read_geometry=False)
+        else:
+            # 尝试不同编码
+            data = None
+            for encoding in ['gbk', 'utf-8', 'gb2312']:
+                try:
+                    data = pyogrio.read_dataframe(str(file_path), columns=[self.field_name],
+                                                  read_geometry=False, encoding=encoding)
+                    break
+                except UnicodeDecodeError:
                     continue
+        # 检查是否有相同字段
+        if data is None or self.field_name not in data.columns:
+            return None
+        return data[self.field_name]
 
-            # 分析值的模式
-            self.analyze_field_patterns(field_values.keys())
-
-            # 更新建议
-            self.similar_field_values = field_values
-            self.update_repair_suggestions(value_frequencies)
-
-            self.status_var.set(f"扫描完成，找到 {len(field_values)} 个可能的值")
-
+    def _on_similar_fields_scanned(self, future):
+        """扫描完成后在主线程中更新模式分析和修复建议"""
+        try:
+            field_values, value_frequencies = future.result()
         except Exception as e:
             logger.error(f"扫描文件时出错: {e}")
             messagebox.showerror("错误", f"扫描文件时出错: {str(e)}")
             self.status_var.set("扫描失败")
+            return
+
+        # 分析值的模式
+        self.analyze_field_patterns(field_values.keys())
+
+        # 更新建议
+        self.similar_field_values = field_values
+        self.update_repair_suggestions(value_frequencies)
+
+        self.status_var.set(f"扫描完成，找到 {len(field_values)} 个可能的值")
 
     def analyze_field_patterns(self, values):
         """分析字段值的模式"""
         if not values:
             return
 
-        patterns = {}
-        for value in values:
+        # 整列一次性分类
+        text = pd.Series(list(values), dtype=object).astype(str)
+        patterns = {
             # 分析数字模式
-            if str(value).replace('.', '').isdigit():
-                patterns['numeric'] = patterns.get('numeric', 0) + 1
-
+            'numeric': int(text.str.match(_NUMERIC_PATTERN).sum()),
             # 分析日期模式
-            if re.search(r'\d{4}[-/]\d{1,2}[-/]\d{1,2}', str(value)):
-                patterns['date'] = patterns.get('date', 0) + 1
-
+            'date': int(text.str.contains(_DATE_PATTERN).sum()),
             # 分析编码模式（例如：XX-123）
-            if re.search(r'^[A-Za-z]+-\d+$', str(value)):
-                patterns['code'] = patterns.get('code', 0) + 1
-
+            'code': int(text.str.match(_CODE_PATTERN).sum()),
             # 分析长度
-            length = len(str(value))
-            if length not in patterns.get('lengths', {}):
-                patterns.setdefault('lengths', {})[length] = 0
-            patterns['lengths'][length] += 1
+            'lengths': text.str.len().value_counts(sort=False).to_dict(),
+        }
 
         self.field_value_patterns = patterns
 
@@ -1302,8 +1978,7 @@ class FieldEditorDialog:
         suggestions = []
 
         # 获取当前空值的行
-        null_items = [item for item in self.tree.get_children()
-                     if isinstance(self.tree.item(item), dict) and 'values' in self.tree.item(item) and len(self.tree.item(item)['values']) > 2 and self.tree.item(item)['values'][2] == '是']
+        null_items = list(self._null_items())
 
         if not null_items:
             suggestions.append("当前没有需要修复的空值。")
@@ -1336,11 +2011,7 @@ class FieldEditorDialog:
                     suggestions.append(f"• 常见长度为 {common_length} 个字符")
 
         # 更新建议文本
-        if self.repair_text is not None:
-            self.repair_text.config(state=tk.NORMAL)
-            self.repair_text.delete('1.0', tk.END)
-            self.repair_text.insert('1.0', '\n'.join(suggestions))
-            self.repair_text.config(state=tk.DISABLED)
+        self._rewrite_text(self.repair_text, '\n'.join(suggestions))
 
     def apply_repair_suggestions(self):
         """应用修复建议"""
@@ -1349,8 +2020,7 @@ class FieldEditorDialog:
             return
 
         # 获取空值项
-        null_items = [item for item in self.tree.get_children()
-                     if isinstance(self.tree.item(item), dict) and 'values' in self.tree.item(item) and len(self.tree.item(item)['values']) > 2 and self.tree.item(item)['values'][2] == '是']
+        null_items = list(self._null_items())
 
         if not null_items:
             messagebox.showinfo("提示", "没有需要修复的空值")
@@ -1388,31 +2058,25 @@ class FieldEditorDialog:
                            key=lambda x: x[1],
                            reverse=True)[0][0]
 
-        # 填充表格
+        # 填充表格（与null_items一一对应）
         for item in null_items:
-            values = self.tree.item(item)['values']
-            tree.insert('', 'end', values=(values[0], '空值', most_common))
+            tree.insert('', 'end', values=(self.tree.set(item, 'index'), '空值', most_common))
 
         # 添加按钮
         button_frame = ttk.Frame(repair_dialog)
         button_frame.pack(fill=tk.X, padx=5, pady=5)
 
         def apply_repairs():
-            for item in tree.get_children():
-                values = tree.item(item)['values']
-                item_id = values[0]
-                suggested = values[2]
+            # 建议表格的行与null_items按顺序一一对应，无需逐行查找主表格
+            for item, main_item in zip(tree.get_children(), null_items):
+                suggested = tree.set(item, 'suggested')
                 # 更新主表格中的值
-                for main_item in null_items:
-                    main_item_data = self.tree.item(main_item)
-                    if (isinstance(main_item_data, dict) and 'values' in main_item_data and
-                        isinstance(main_item_data['values'], (list, tuple)) and len(main_item_data['values']) > 0 and main_item_data['values'][0] == item_id):
-                        self.tree.set(main_item, 'value', suggested)
-                        self.tree.set(main_item, 'is_null', '否')
-                        break
+                self.tree.set(main_item, 'value', suggested)
+                self._store_value(main_item, suggested)
+                self._mark_null_state(main_item, False)
 
             repair_dialog.destroy()
-            self.update_statistics()
+            self._schedule_statistics()
             self.status_var.set("已应用修复建议")
 
         ttk.Button(button_frame, text="应用全部", command=apply_repairs).pack(side=tk.LEFT, padx=5)
@@ -1431,19 +2095,16 @@ class FieldEditorDialog:
                 return
 
             # 获取所有空值项
-            null_items = [item for item in self.tree.get_children()
-                         if isinstance(self.tree.item(item), dict) and 'values' in self.tree.item(item) and len(self.tree.item(item)['values']) > 2 and self.tree.item(item)['values'][2] == '是']
+            null_items = list(self._null_items())
 
             if not null_items:
                 messagebox.showinfo("提示", "没有需要填充的空值")
                 return
 
             # 填充所有空值
-            for item in null_items:
-                self.tree.set(item, 'value', most_common_value)
-                self.tree.set(item, 'is_null', '否')
+            self._fill_rows(null_items, most_common_value)
 
-            self.update_statistics()
+            self._schedule_statistics()
             self.status_var.set(f"已填充 {len(null_items)} 个空值")
 
             # 调试日志
@@ -1477,34 +2138,18 @@ class FieldEditorDialog:
                 return
 
             # 获取所有空值项
-            null_items = [item for item in self.tree.get_children()
-                         if isinstance(self.tree.item(item), dict) and 'values' in self.tree.item(item) and len(self.tree.item(item)['values']) > 2 and self.tree.item(item)['values'][2] == '是']
+            null_items = list(self._null_items())
 
-            # 填充所有空值
-            for item in null_items:
-                self.tree.set(item, 'value', most_common_value)
-                self.tree.set(item, 'is_null', '否')
-                # 更新标签为已修复
-                self.tree.item(item, tags=('fixed',))
+            # 填充所有空值，并标记为已修复
+            self._fill_rows(null_items, most_common_value)
 
-            self.update_statistics()
+            self._schedule_statistics()
             messagebox.showinfo("完成", f"已修复 {len(null_items)} 个空值")
             self.status_var.set(f"已修复 {len(null_items)} 个空值")
 
             # 更新建议
             self.analyze_data_patterns()
 
-            # --- 同步表格内容到self.modified_data ---
-            if self.modified_data is not None:
-                for item in self.tree.get_children():
-                    values = self.tree.item(item, 'values')
-                    index = int(values[0]) - 1
-                    value = values[1]
-                    if value == "(空值)":
-                        self.modified_data.loc[index, self.field_name] = None
-                    else:
-                        self.modified_data.loc[index, self.field_name] = value
-
         except Exception as e:
             logger.error(f"快速修复时出错: {e}", exc_info=True)
             messagebox.showerror("错误", "修复过程中出错")
@@ -1536,26 +2181,27 @@ class FieldEditorDialog:
             messagebox.showwarning("警告", "请先选择要处理的项")
             return
 
-        count = 0
-        for item in selected:
-            item_data = self.tree.item(item)
-            value = item_data.get('values')[1] if item_data else None
-            if value is None or pd.isna(value) or value == "":
-                continue
-
-            if transform_type == 'upper':
-                new_value = str(value).upper()
-            elif transform_type == 'lower':
-                new_value = str(value).lower()
-            elif transform_type == 'strip':
-                new_value = str(value).strip()
+        # 每行一次读取（字符串形式），整列转换后只回写发生变化的行
+        rows = [self.tree.set(item) for item in selected]
+        old_values = pd.Series([row.get('value', '') for row in rows], dtype=object)
+        if transform_type == 'upper':
+            new_values = old_values.str.upper()
+        elif transform_type == 'lower':
+            new_values = old_values.str.lower()
+        elif transform_type == 'strip':
+            new_values = old_values.str.strip()
+        else:
+            return
+        changed = ((new_values != old_values) & (old_values != '')).to_numpy()
 
-            if new_value != value:
-                self.tree.set(item, 'value', new_value)
-                count += 1
+        count = 0
+        for position in np.flatnonzero(changed):
+            # 去空格后可能变为空值，同步空值标记
+            self._set_row_value(selected[position], new_values.iat[position], rows[position])
+            count += 1
 
         if count > 0:
-            self.update_statistics()
+            self._schedule_statistics()
             self.status_var.set(f"已处理 {count} 个值")
 
     def batch_replace(self):
@@ -1609,29 +2255,27 @@ class FieldEditorDialog:
                 messagebox.showwarning("警告", "请先选择要处理的项")
                 return
 
-            count = 0
-            for item in selected:
-                item_data = self.tree.item(item)
-                value = item_data.get('values')[1] if item_data else None
-                if value is None or pd.isna(value) or value == "":
-                    continue
-
-                if not case_sensitive_var.get():
-                    pattern = re.compile(re.escape(find_text), re.IGNORECASE)
-                else:
-                    pattern = re.compile(re.escape(find_text))
-
-                if whole_word_var.get():
-                    pattern = re.compile(r'\b' + re.escape(find_text) + r'\b',
-                                      re.IGNORECASE if not case_sensitive_var.get() else 0)
+            # 每行一次读取，整列替换后只回写发生变化的行
+            rows = [self.tree.set(item) for item in selected]
+            old_values = pd.Series([row.get('value', '') for row in rows], dtype=object)
+            case_sensitive = case_sensitive_var.get()
+            whole_word = whole_word_var.get()
+            if case_sensitive and not whole_word and '\\' not in replace_text:
+                # 纯文本替换无需正则
+                new_values = old_values.str.replace(find_text, replace_text, regex=False)
+            else:
+                pattern = _get_replace_pattern(find_text, case_sensitive, whole_word)
+                new_values = old_values.str.replace(pattern, replace_text, regex=True)
+            changed = ((new_values != old_values) & (old_values != '')).to_numpy()
 
-                new_value = pattern.sub(replace_text, value)
-                if new_value != value:
-                    self.tree.set(item, 'value', new_value)
-                    count += 1
+            count = 0
+            for position in np.flatnonzero(changed):
+                # 替换为空串时同步空值标记
+                self._set_row_value(selected[position], new_values.iat[position], rows[position])
+                count += 1
 
             if count > 0:
-                self.update_statistics()
+                self._schedule_statistics()
                 self.status_var.set(f"已替换 {count} 处")
                 dialog.destroy()
             else:
@@ -1645,11 +2289,7 @@ class FieldEditorDialog:
 
     def get_field_standards(self):
         """获取字段标准信息"""
-        try:
-            from shp_field_checker_gui import DEFAULT_FIELD_STANDARDS
-            return DEFAULT_FIELD_STANDARDS.get(self.field_name, {})
-        except ImportError:
-            return {}
+        return _load_all_standards().get(self.field_name, {})
 
     def refresh_data(self, event=None):
         """刷新数据"""
@@ -1714,35 +2354,10 @@ class FieldEditorDialog:
         def do_export():
             try:
                 # 获取要导出的数据
-                data = []
-                if range_var.get() == "all":
-                    items = self.tree.get_children()
-                elif range_var.get() == "selected":
-                    items = self.tree.selection()
-                else:  # non_null
-                    items = [item for item in self.tree.get_children()
-                            if self.tree.item(item)['values'][2] == '否']
-
-                # 构建列
-                columns = []
-                if include_index_var.get():
-                    columns.append("序号")
-                columns.append("字段值")
-                columns.append("是否为空")
-                if include_validation_var.get():
-                    columns.append("验证状态")
-
-                # 收集数据
-                for item in items:
-                    values = self.tree.item(item)['values']
-                    row = {}
-                    if include_index_var.get():
-                        row["序号"] = values[0]
-                    row["字段值"] = values[1]
-                    row["是否为空"] = values[2]
-                    if include_validation_var.get() and len(values) > 3:
-                        row["验证状态"] = values[3]
-                    data.append(row)
+                data = self._export_frame(range_var.get(), include_validation_var.get())
+                if not include_index_var.get():
+                    data = data.drop(columns="序号")
+                columns = list(data.columns)
 
                 # 选择保存路径
                 file_types = {
@@ -1761,22 +2376,15 @@ class FieldEditorDialog:
 
                 # 导出数据
                 if format_var.get() == "csv":
-                    with open(file_path, 'w', newline='', encoding='utf-8-sig') as f:
-                        writer = csv.DictWriter(f, fieldnames=columns)
-                        if include_header_var.get():
-                            writer.writeheader()
-                        writer.writerows(data)
+                    data.to_csv(file_path, index=False, header=include_header_var.get(),
+                                encoding='utf-8-sig')
 
                 elif format_var.get() == "excel":
-                    df = pd.DataFrame(data)
-                    if not include_header_var.get():
-                        df.to_excel(file_path, index=False, header=False)
-                    else:
-                        df.to_excel(file_path, index=False)
+                    headers = columns if include_header_var.get() else None
+                    self._write_xlsx_rows(file_path, headers, data.itertuples(index=False, name=None))
 
                 else:  # json
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        json.dump(data, f, ensure_ascii=False, indent=2)
+                    data.to_json(file_path, orient='records', force_ascii=False, indent=2)
 
                 messagebox.showinfo("成功", "数据导出完成")
                 dialog.destroy()
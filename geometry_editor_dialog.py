@@ -19,20 +19,93 @@ import json
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.patches import Polygon as MplPolygon
-from matplotlib.collections import PatchCollection
+from matplotlib.collections import PatchCollection, PolyCollection, LineCollection
 import matplotlib.patches as patches
+from matplotlib.colors import to_rgb
 from shapely.geometry import Point, LineString, Polygon, MultiPolygon, shape
 from shapely.validation import make_valid
 from shapely.ops import unary_union
+import shapely
 import shapely.affinity
 import shapely.ops
 from shapely import wkt
-import math
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pyogrio
 
 
 logger = logging.getLogger(__name__)
 
+# 一键修复时每个工作线程处理的几何数量
+_FIX_CHUNK_SIZE = 50000
+
+# 统计面积/长度时计入的几何类型（shapefile图层中单部件与多部件混存）
+_AREAL_TYPES = [shapely.GeometryType.POLYGON, shapely.GeometryType.MULTIPOLYGON]
+_LINEAR_TYPES = [shapely.GeometryType.LINESTRING, shapely.GeometryType.MULTILINESTRING]
+
+
+def _make_valid_array(geometries):
+    """批量修复无效几何，返回几何对象数组（空几何保持为None）
+
+    整列一次调用GEOS；批量修复出错时退回逐个修复，失败的几何保持原样。
+    """
+    geoms = np.array(geometries, dtype=object)
+    invalid = ~shapely.is_valid(geoms) & ~shapely.is_missing(geoms)
+    if not invalid.any():
+        return geoms
+    try:
+        geoms[invalid] = shapely.make_valid(geoms[invalid])
+    except shapely.errors.GEOSException:
+        for idx in np.flatnonzero(invalid):
+            try:
+                geoms[idx] = make_valid(geoms[idx])
+            except Exception as fix_error:
+                logger.warning(f"修复几何 {idx} 失败: {fix_error}")
+    return geoms
+
+
+def _split_coordinates(geometries, counts):
+    """一次取出一组几何的全部坐标，再按每个几何的坐标数拆分为(n, 2)数组列表"""
+    coords = shapely.get_coordinates(geometries)
+    return np.split(coords, np.cumsum(counts)[:-1])
+
+
+def _compute_geometry_columns(geometries):
+    """一次性计算一组几何的派生列（类型编码、面积、长度、有效性、顶点数等）"""
+    geometries = np.asarray(geometries, dtype=object)
+    return {
+        'types': shapely.get_type_id(geometries),
+        'missing': shapely.is_missing(geometries),
+        'empty': shapely.is_empty(geometries),
+        'valid': shapely.is_valid(geometries),
+        'simple': shapely.is_simple(geometries),
+        'area': shapely.area(geometries),
+        'length': shapely.length(geometries),
+        'nverts': shapely.get_num_coordinates(geometries),
+    }
+
+
+def _reduce_to_largest_part(geometries, type_id, size_func):
+    """把geometries中指定类型的多部件几何原地替换为其最大的部件
+
+    size_func为衡量部件大小的shapely函数，大小相同时取靠前的部件；
+    为None时直接取第一个部件。没有部件的空几何保持不变。
+    """
+    positions = np.flatnonzero(shapely.get_type_id(geometries) == type_id)
+    if not positions.size:
+        return
+
+    parts, part_index = shapely.get_parts(geometries[positions], return_index=True)
+    if not parts.size:
+        return
+
+    order = np.arange(len(parts))
+    if size_func is not None:
+        # 组内按大小降序、原顺序升序排列，每组第一个即为最大部件
+        order = np.lexsort((order, -size_func(parts), part_index))
+    groups, first = np.unique(part_index[order], return_index=True)
+    geometries[positions[groups]] = parts[order[first]]
+
+
 class GeometryEditorDialog:
     """几何编辑弹窗"""
 
@@ -50,6 +123,13 @@ class GeometryEditorDialog:
         self.layer_name = layer_name
         self.original_gdf = None
         self.modified_gdf = None
+        # modified_gdf几何派生列缓存（类型、面积、长度等），几何变化时置空
+        self._geom_cache = None
+        # 一键修复是否正在后台进行，后台修复在单独的工作线程中执行
+        self._fixing = False
+        self._fix_executor = ThreadPoolExecutor(max_workers=1)
+        # 工作线程写入的修复进度(已完成块数, 总块数)，由主线程轮询显示
+        self._fix_progress = None
         self.selected_features = set()
         self.geometry_issues = []
 
@@ -70,6 +150,8 @@ class GeometryEditorDialog:
         self.dialog.minsize(1400, 900)     # 增大最小窗口尺寸
         self.dialog.transient(parent)
         self.dialog.grab_set()
+        # 弹窗关闭时停止后台修复线程
+        self.dialog.bind('<Destroy>', self._on_dialog_destroy, add='+')
 
         # 设置弹窗位置为屏幕中心
         self.dialog.update_idletasks()
@@ -240,25 +322,25 @@ class GeometryEditorDialog:
         """加载几何数据"""
         try:
             self.status_var.set("正在加载数据...")
-            self.dialog.update()
+            self.dialog.update_idletasks()
 
             # 读取文件
             if self.file_path.suffix.lower() == '.gdb':
                 if self.layer_name:
-                    self.original_gdf = gpd.read_file(self.file_path, layer=self.layer_name)
+                    self.original_gdf = gpd.read_file(self.file_path, layer=self.layer_name, engine='pyogrio')
                 else:
                     # 读取第一个图层
                     import pyogrio  # 修复未定义pyogrio的问题
                     layers = pyogrio.list_layers(str(self.file_path))
                     if layers:
-                        self.original_gdf = gpd.read_file(self.file_path, layer=layers[0])
+                        self.original_gdf = gpd.read_file(self.file_path, layer=layers[0], engine='pyogrio')
                     else:
                         raise ValueError("GDB文件中没有找到图层")
             else:
                 # 尝试不同编码
                 for encoding in ['gbk', 'utf-8', 'gb2312']:
                     try:
-                        self.original_gdf = gpd.read_file(self.file_path, encoding=encoding)
+                        self.original_gdf = gpd.read_file(self.file_path, encoding=encoding, engine='pyogrio')
                         break
                     except UnicodeDecodeError:
                         continue
@@ -277,31 +359,19 @@ class GeometryEditorDialog:
 
             # 尝试修复几何错误
             self.status_var.set("正在修复几何错误...")
-            self.dialog.update()
-
-            # 修复无效几何
-            fixed_geometries = []
-            for idx, row in self.original_gdf.iterrows():
-                geom = row.geometry
-                if geom is not None:
-                    try:
-                        # 尝试修复几何
-                        if not geom.is_valid:
-                            fixed_geom = make_valid(geom)
-                            if fixed_geom is not None:
-                                geom = fixed_geom
-                    except Exception as fix_error:
-                        logger.warning(f"修复几何 {idx} 失败: {fix_error}")
-                        # 如果修复失败，保持原几何
+            self.dialog.update_idletasks()
 
-                fixed_geometries.append(geom)
+            # 修复无效几何（整列一次修复）
+            fixed_geometries = _make_valid_array(self.original_gdf.geometry.values)
 
             # 创建修复后的GeoDataFrame
             self.original_gdf = self.original_gdf.copy()
-            self.original_gdf.geometry = fixed_geometries
+            self.original_gdf.geometry = gpd.GeoSeries(fixed_geometries, index=self.original_gdf.index,
+                                                       crs=self.original_gdf.crs)
 
             # 复制数据用于编辑
             self.modified_gdf = self.original_gdf.copy()
+            self._invalidate_geom_cache()
 
             # 更新界面
             self.update_geometry_info()
@@ -315,23 +385,23 @@ class GeometryEditorDialog:
             # 尝试更宽松的加载方式
             try:
                 self.status_var.set("尝试宽松模式加载...")
-                self.dialog.update()
+                self.dialog.update_idletasks()
 
                 # 使用更宽松的参数读取文件
                 if self.file_path.suffix.lower() == '.gdb':
                     if self.layer_name:
-                        self.original_gdf = gpd.read_file(self.file_path, layer=self.layer_name, ignore_geometry=True)
+                        self.original_gdf = gpd.read_file(self.file_path, layer=self.layer_name, ignore_geometry=True, engine='pyogrio')
                     else:
                         import pyogrio
                         layers = pyogrio.list_layers(str(self.file_path))
                         if layers:
-                            self.original_gdf = gpd.read_file(self.file_path, layer=layers[0], ignore_geometry=True)
+                            self.original_gdf = gpd.read_file(self.file_path, layer=layers[0], ignore_geometry=True, engine='pyogrio')
                         else:
                             raise ValueError("GDB文件中没有找到图层")
                 else:
                     for encoding in ['gbk', 'utf-8', 'gb2312']:
                         try:
-                            self.original_gdf = gpd.read_file(self.file_path, encoding=encoding, ignore_geometry=True)
+                            self.original_gdf = gpd.read_file(self.file_path, encoding=encoding, ignore_geometry=True, engine='pyogrio')
                             break
                         except UnicodeDecodeError:
                             continue
@@ -340,6 +410,7 @@ class GeometryEditorDialog:
                     # 创建空的几何列
                     self.original_gdf['geometry'] = None
                     self.modified_gdf = self.original_gdf.copy()
+                    self._invalidate_geom_cache()
 
                     self.update_geometry_info()
                     self.populate_geometry_list()
@@ -363,7 +434,7 @@ class GeometryEditorDialog:
         """尝试从原始文件重新构建几何"""
         try:
             self.status_var.set("尝试重新构建几何...")
-            self.dialog.update()
+            self.dialog.update_idletasks()
 
             # 使用pyogrio读取数据
             import pyogrio
@@ -377,7 +448,7 @@ class GeometryEditorDialog:
                         geometries = gdf.geometry.tolist()
                     except Exception:
                         # 如果读取失败，尝试忽略几何
-                        gdf = pyogrio.read_dataframe(str(self.file_path), layer=self.layer_name, ignore_geometry=True)
+                        gdf = pyogrio.read_dataframe(str(self.file_path), layer=self.layer_name, read_geometry=False)
                         geometries = [None] * len(gdf)
                 else:
                     layers = pyogrio.list_layers(str(self.file_path))
@@ -387,7 +458,7 @@ class GeometryEditorDialog:
                             geometries = gdf.geometry.tolist()
                         except Exception:
                             # 如果读取失败，尝试忽略几何
-                            gdf = pyogrio.read_dataframe(str(self.file_path), layer=layers[0], ignore_geometry=True)
+                            gdf = pyogrio.read_dataframe(str(self.file_path), layer=layers[0], read_geometry=False)
                             geometries = [None] * len(gdf)
             else:
                 try:
@@ -395,7 +466,7 @@ class GeometryEditorDialog:
                     geometries = gdf.geometry.tolist()
                 except Exception:
                     # 如果读取失败，尝试忽略几何
-                    gdf = pyogrio.read_dataframe(str(self.file_path), ignore_geometry=True)
+                    gdf = pyogrio.read_dataframe(str(self.file_path), read_geometry=False)
                     geometries = [None] * len(gdf)
 
             # 创建新的GeoDataFrame
@@ -406,9 +477,12 @@ class GeometryEditorDialog:
                     geometries.append(None)
                 geometries = geometries[:len(gdf)]
 
-                # 创建GeoDataFrame
-                self.original_gdf = gpd.GeoDataFrame(gdf.drop(columns=['geometry']), geometry=geometries)
+                # 创建GeoDataFrame（整列修复无效几何）
+                self.original_gdf = gpd.GeoDataFrame(gdf.drop(columns=['geometry'], errors='ignore'),
+                                                     geometry=list(_make_valid_array(geometries)),
+                                                     crs=getattr(gdf, 'crs', None))
                 self.modified_gdf = self.original_gdf.copy()
+                self._invalidate_geom_cache()
 
                 self.update_geometry_info()
                 self.populate_geometry_list()
@@ -434,21 +508,25 @@ class GeometryEditorDialog:
 
         # 检查是否有几何数据
         if 'geometry' in self.original_gdf.columns and self.original_gdf.geometry.notna().any():
-            geom_types = self.original_gdf.geometry.geom_type.unique()
+            geom_types = self.original_gdf.geometry.geom_type.dropna().unique()
             info_text += f"几何类型: {', '.join(geom_types)}\n"
 
-            # 计算总面积/长度
-            if 'Polygon' in geom_types:
-                total_area = self.original_gdf.geometry.area.sum()
+            # 按类型编码一次划分面/线，只对对应几何计算面积和长度
+            geoms = self.original_gdf.geometry.values
+            type_ids = shapely.get_type_id(geoms)
+            is_polygon = np.isin(type_ids, _AREAL_TYPES)
+            is_line = np.isin(type_ids, _LINEAR_TYPES)
+
+            if is_polygon.any():
+                total_area = shapely.area(geoms[is_polygon]).sum()
                 info_text += f"总面积: {total_area:.2f}\n"
 
-            if 'LineString' in geom_types:
-                total_length = self.original_gdf.geometry.length.sum()
+            if is_line.any():
+                total_length = shapely.length(geoms[is_line]).sum()
                 info_text += f"总长度: {total_length:.2f}\n"
 
-            # 统计顶点数
-            total_vertices = sum(len(geom.coords) if hasattr(geom, 'coords') and geom is not None else 0
-                               for geom in self.original_gdf.geometry)
+            # 统计顶点数（GEOS中一次统计全部几何）
+            total_vertices = int(shapely.get_num_coordinates(geoms).sum())
             info_text += f"总顶点数: {total_vertices}\n"
         else:
             info_text += "几何类型: 无几何数据\n"
@@ -460,47 +538,46 @@ class GeometryEditorDialog:
         self.geometry_info_text.insert('1.0', info_text)
         self.geometry_info_text.config(state=tk.DISABLED)
 
+    def _invalidate_geom_cache(self):
+        """modified_gdf的几何被替换或修改后，清除几何派生列缓存"""
+        self._geom_cache = None
+
+    def _geometry_columns(self):
+        """返回modified_gdf几何派生列，首次访问时计算并缓存"""
+        if self._geom_cache is None:
+            self._geom_cache = _compute_geometry_columns(self.modified_gdf.geometry.values)
+        return self._geom_cache
+
     def populate_geometry_list(self):
         """填充几何要素列表"""
         if self.modified_gdf is None:
             return
 
         # 清空列表
-        for item in self.geometry_tree.get_children():
-            self.geometry_tree.delete(item)
+        self.geometry_tree.delete(*self.geometry_tree.get_children())
 
-        # 添加几何要素
-        for idx, row in self.modified_gdf.iterrows():
-            geom = row.geometry
-            geom_type = geom.geom_type if geom is not None else 'None'
-
-            # 计算面积或长度
-            if geom is not None and geom_type == 'Polygon':
-                area_length = f"{geom.area:.2f}"
-            elif geom is not None and geom_type == 'LineString':
-                area_length = f"{geom.length:.2f}"
-            else:
-                area_length = "N/A"
-
-            # 计算顶点数
-            if geom is not None and hasattr(geom, 'coords'):
-                vertex_count = len(geom.coords)
-            else:
-                vertex_count = 0
+        # 从缓存的几何派生列格式化类型、面积/长度、顶点数和有效性
+        columns = self._geometry_columns()
+        geom_types = self.modified_gdf.geometry.geom_type.fillna('None').tolist()
+        is_polygon = np.isin(columns['types'], _AREAL_TYPES)
+        has_measure = is_polygon | np.isin(columns['types'], _LINEAR_TYPES)
+        measures = np.where(is_polygon, columns['area'], columns['length'])
+        area_lengths = [f"{value:.2f}" if flag else "N/A" for value, flag in zip(measures.tolist(), has_measure)]
+        vertex_counts = columns['nverts'].tolist()
+        statuses = np.where(columns['valid'], "有效", "无效").tolist()
 
-            # 检查几何有效性
-            is_valid = geom.is_valid if geom is not None else False
-            status = "有效" if is_valid else "无效"
+        all_issues = self.detect_issues_bulk(self.modified_gdf.geometry.values, columns)
 
-            # 检查问题
-            issues = self.check_geometry_issues(geom)
+        # 添加几何要素
+        for pos, idx in enumerate(self.modified_gdf.index.tolist()):
+            issues = all_issues[pos]
             # 修正：确保所有元素为str
             issue_text = "; ".join(str(i) for i in issues) if issues else "无"
 
             # 确保idx是整数类型
             display_idx = int(idx) if isinstance(idx, (int, float)) else 0
             self.geometry_tree.insert('', 'end', values=(
-                display_idx + 1, geom_type, area_length, vertex_count, status, issue_text
+                display_idx + 1, geom_types[pos], area_lengths[pos], vertex_counts[pos], statuses[pos], issue_text
             ))
 
         # 更新几何可视化
@@ -518,38 +595,7 @@ class GeometryEditorDialog:
             # 检查是否有几何数据
             if 'geometry' in self.modified_gdf.columns and self.modified_gdf.geometry.notna().any():
                 # 绘制几何要素
-                for idx, row in self.modified_gdf.iterrows():
-                    geom = row.geometry
-                    if geom is not None:
-                        try:
-                            # 根据几何类型绘制
-                            if geom.geom_type == 'Polygon':
-                                # 绘制多边形
-                                coords = list(geom.exterior.coords)
-                                if len(coords) > 2:
-                                    x_coords = [coord[0] for coord in coords]
-                                    y_coords = [coord[1] for coord in coords]
-                                    self.ax.fill(x_coords, y_coords, alpha=0.5, edgecolor='black', linewidth=1)
-                                    self.ax.plot(x_coords, y_coords, 'k-', linewidth=1)
-
-                            elif geom.geom_type == 'LineString':
-                                # 绘制线
-                                coords = list(geom.coords)
-                                if len(coords) > 1:
-                                    x_coords = [coord[0] for coord in coords]
-                                    y_coords = [coord[1] for coord in coords]
-                                    self.ax.plot(x_coords, y_coords, 'b-', linewidth=2)
-
-                            elif geom.geom_type == 'Point':
-                                # 绘制点
-                                coords = list(geom.coords)
-                                if coords:
-                                    x_coords = [coord[0] for coord in coords]
-                                    y_coords = [coord[1] for coord in coords]
-                                    self.ax.scatter(x_coords, y_coords, c='red', s=50, zorder=5)
-                        except Exception as geom_error:
-                            logger.warning(f"绘制几何 {idx} 失败: {geom_error}")
-                            continue
+                self._draw_geometries()
 
             # 设置坐标轴
             self.ax.set_aspect('equal')
@@ -571,34 +617,122 @@ class GeometryEditorDialog:
             self.ax.set_title('几何可视化错误')
             self.canvas.draw()
 
+    def _display_geometries(self):
+        """返回用于绘制的几何数组，按一个屏幕像素的容差简化（Douglas-Peucker）
+
+        简化结果缓存在几何派生列缓存中，画布像素容差变化不超过2倍时直接复用。
+        """
+        columns = self._geometry_columns()
+        geoms = np.asarray(self.modified_gdf.geometry.values, dtype=object)
+
+        # 全图显示时一个像素对应的地图距离
+        xmin, ymin, xmax, ymax = self.modified_gdf.total_bounds
+        tolerance = max(xmax - xmin, ymax - ymin) / max(self.ax.bbox.width, 1)
+
+        cached = columns.get('display')
+        if cached is not None and cached[0] / 2 <= tolerance <= cached[0] * 2:
+            return cached[1]
+
+        if np.isfinite(tolerance) and tolerance > 0:
+            display = shapely.simplify(geoms, tolerance, preserve_topology=False)
+            # 小于一个像素而被简化为空的几何改用保持拓扑的简化，避免要素从图上消失
+            collapsed = shapely.is_empty(display) & ~columns['empty']
+            if collapsed.any():
+                display[collapsed] = shapely.simplify(geoms[collapsed], tolerance, preserve_topology=True)
+        else:
+            display = geoms
+
+        columns['display'] = (tolerance, display)
+        return display
+
+    def _draw_geometries(self, highlight=None):
+        """按几何类型各用一个集合绘制全部要素，highlight为需要高亮的要素位置
+
+        面用PolyCollection、线用LineCollection、点用一次scatter，
+        不再为每个要素单独创建图形对象；坐标用shapely.get_coordinates批量取出。
+        """
+        geoms = self._display_geometries()
+        type_ids = self._geometry_columns()['types']
+
+        # 面（只绘制外环），坐标一次取出后按环拆分
+        polygon_positions = np.flatnonzero(type_ids == shapely.GeometryType.POLYGON)
+        rings = shapely.get_exterior_ring(geoms[polygon_positions])
+        counts = shapely.get_num_coordinates(rings)
+        polygon_positions, rings, counts = polygon_positions[counts > 2], rings[counts > 2], counts[counts > 2]
+        if polygon_positions.size:
+            verts = _split_coordinates(rings, counts)
+            if highlight is None:
+                facecolors = [(*to_rgb(f'C{k % 10}'), 0.5) for k in range(len(verts))]
+            else:
+                facecolors = [(1, 0, 0, 0.7) if i == highlight else (*to_rgb(f'C{k % 10}'), 0.3)
+                              for k, i in enumerate(polygon_positions)]
+            self.ax.add_collection(PolyCollection(verts, facecolors=facecolors,
+                                                  edgecolors='black', linewidths=1))
+            if highlight in polygon_positions:
+                selected = verts[int(np.flatnonzero(polygon_positions == highlight)[0])]
+                self.ax.plot(selected[:, 0], selected[:, 1], 'r-', linewidth=2)
+
+        # 线
+        line_positions = np.flatnonzero(type_ids == shapely.GeometryType.LINESTRING)
+        lines = geoms[line_positions]
+        counts = shapely.get_num_coordinates(lines)
+        line_positions, lines, counts = line_positions[counts > 1], lines[counts > 1], counts[counts > 1]
+        if line_positions.size:
+            segments = _split_coordinates(lines, counts)
+            self.ax.add_collection(LineCollection(
+                [segment for segment, i in zip(segments, line_positions) if i != highlight],
+                colors='b', linewidths=2))
+            if highlight in line_positions:
+                selected = segments[int(np.flatnonzero(line_positions == highlight)[0])]
+                self.ax.plot(selected[:, 0], selected[:, 1], 'r-', linewidth=4)
+
+        # 点
+        point_positions = np.flatnonzero((type_ids == shapely.GeometryType.POINT) & ~shapely.is_empty(geoms))
+        if point_positions.size:
+            points = shapely.get_coordinates(geoms[point_positions])
+            if highlight is None:
+                self.ax.scatter(points[:, 0], points[:, 1], c='red', s=50, zorder=5)
+            else:
+                is_selected = point_positions == highlight
+                if (~is_selected).any():
+                    self.ax.scatter(points[~is_selected, 0], points[~is_selected, 1], c='blue', s=50, zorder=5)
+                if is_selected.any():
+                    self.ax.scatter(points[is_selected, 0], points[is_selected, 1], c='red', s=100, zorder=5)
+
+        # 集合不会自动更新坐标范围
+        self.ax.autoscale_view()
+
     def check_geometry_issues(self, geom):
         """检查单个几何的问题"""
-        issues = []
+        return self.detect_issues_bulk(np.array([geom], dtype=object))[0]
 
-        if geom is None:
-            return ["空几何"]
-
-        # 检查有效性
-        if not geom.is_valid:
-            issues.append("几何无效")
-
-        # 检查自相交
-        if geom.geom_type == 'Polygon' and not geom.is_simple:
-            issues.append("自相交")
-
-        # 检查面积
-        if geom.geom_type == 'Polygon':
-            if geom.area == 0:
-                issues.append("零面积")
-            elif geom.area < 0.0001:  # 极小面积
-                issues.append("面积过小")
-
-        # 检查长度
-        if geom.geom_type == 'LineString':
-            if geom.length == 0:
-                issues.append("零长度")
-            elif geom.length < 0.001:  # 极小长度
-                issues.append("长度过小")
+    def detect_issues_bulk(self, geoms, columns=None):
+        """对整列几何一次性检查问题，返回与输入等长的问题列表
+
+        columns为已计算好的几何派生列（见_compute_geometry_columns），未提供时现算。
+        """
+        if columns is None:
+            columns = _compute_geometry_columns(geoms)
+        missing = columns['missing']
+        is_polygon = np.isin(columns['types'], _AREAL_TYPES)
+        is_line = np.isin(columns['types'], _LINEAR_TYPES)
+        area = columns['area']
+        length = columns['length']
+
+        # 问题顺序与逐个检查时一致：有效性、自相交、面积、长度
+        checks = [
+            ("几何无效", ~missing & ~columns['valid']),
+            ("自相交", is_polygon & ~columns['simple']),
+            ("零面积", is_polygon & (area == 0)),
+            ("面积过小", is_polygon & (area > 0) & (area < 0.0001)),  # 极小面积
+            ("零长度", is_line & (length == 0)),
+            ("长度过小", is_line & (length > 0) & (length < 0.001)),  # 极小长度
+        ]
+
+        issues = [["空几何"] if flag else [] for flag in missing]
+        for problem, mask in checks:
+            for pos in np.flatnonzero(mask):
+                issues[pos].append(problem)
 
         return issues
 
@@ -607,18 +741,13 @@ class GeometryEditorDialog:
         if self.modified_gdf is None:
             return
 
-        self.geometry_issues = []
-
-        for idx, row in self.modified_gdf.iterrows():
-            geom = row.geometry
-            issues = self.check_geometry_issues(geom)
-
-            if issues:
-                self.geometry_issues.append({
-                    'index': idx,
-                    'geometry': geom,
-                    'issues': issues
-                })
+        geoms = self.modified_gdf.geometry.values
+        self.geometry_issues = [
+            {'index': idx, 'geometry': geoms[pos], 'issues': issues}
+            for pos, (idx, issues) in enumerate(zip(self.modified_gdf.index,
+                                                    self.detect_issues_bulk(geoms, self._geometry_columns())))
+            if issues
+        ]
 
         # 更新问题显示
         self.update_issues_display()
@@ -649,62 +778,154 @@ class GeometryEditorDialog:
         self.issues_text.config(state=tk.DISABLED)
 
     def auto_fix_all(self):
-        """一键修复所有几何问题"""
-        if self.modified_gdf is None:
+        """一键修复所有几何问题（后台线程修复，完成后回到主线程更新界面）"""
+        if self.modified_gdf is None or self._fixing:
             return
 
         try:
-            self.status_var.set("正在修复几何问题...")
-            self.dialog.update()
-
             tolerance = float(self.tolerance_var.get())
-            fixed_count = 0
-            error_count = 0
+        except ValueError as e:
+            logger.error(f"自动修复失败: {e}")
+            messagebox.showerror("错误", f"自动修复失败: {str(e)}")
+            return
+
+        # Tk变量只能在主线程读取，先取出修复选项
+        fix_gaps = self.fix_gaps_var.get()
+        repair_method = self.gap_repair_method.get()
+        snap = self.snap_vertices_var.get()
+        source_gdf = self.modified_gdf
+
+        self._fixing = True
+        self.status_var.set("正在修复几何问题...")
+        self.dialog.update_idletasks()
+
+        def run_fix():
+            gdf = source_gdf
             gap_repair_count = 0
 
             # 1. 修复面缝隙（如果启用）
-            if self.fix_gaps_var.get():
-                try:
-                    gap_repair_count = self.fix_topology_gaps(tolerance)
-                    logger.info(f"缝隙修复完成: {gap_repair_count} 个缝隙")
-                except Exception as e:
-                    logger.warning(f"缝隙修复失败: {e}")
-
-            # 2. 修复其他几何问题
-            for idx, row in self.modified_gdf.iterrows():
+            if fix_gaps:
+                gdf, gap_repair_count = self._repair_topology_gaps(gdf, tolerance, repair_method)
+                logger.info(f"缝隙修复完成: {gap_repair_count} 个缝隙")
+
+            # 2. 修复其他几何问题（分块并行，shapely在GEOS计算期间释放GIL）
+            original_geoms = np.asarray(gdf.geometry.values, dtype=object)
+            fixed_geoms, error_count = self._fix_geometries_parallel(original_geoms, tolerance, snap)
+
+            unchanged = shapely.equals_exact(fixed_geoms, original_geoms, tolerance=0) | \
+                (shapely.is_missing(fixed_geoms) & shapely.is_missing(original_geoms))
+            fixed_count = int((~unchanged).sum())
+            if fixed_count:
+                if gdf is source_gdf:
+                    gdf = gdf.copy()
+                gdf.geometry = gpd.GeoSeries(fixed_geoms, index=gdf.index, crs=gdf.crs)
+
+            return gdf, fixed_count, error_count, gap_repair_count
+
+        self._fix_progress = None
+        future = self._fix_executor.submit(run_fix)
+        self._poll_future(future, lambda f: self._on_auto_fix_done(f, source_gdf),
+                          on_wait=self._show_fix_progress)
+
+    def _poll_future(self, future, callback, interval=50, on_wait=None):
+        """在主线程中轮询工作线程结果，完成后调用callback(future)，等待期间每次调用on_wait()"""
+        try:
+            if not self.dialog.winfo_exists():
+                return
+        except tk.TclError:
+            return
+        if future.done():
+            callback(future)
+        else:
+            if on_wait is not None:
+                on_wait()
+            self.dialog.after(interval, self._poll_future, future, callback, interval, on_wait)
+
+    def _show_fix_progress(self):
+        """显示工作线程报告的分块修复进度（主线程）"""
+        if self._fix_progress is not None:
+            done, total = self._fix_progress
+            if total > 1:
+                self.status_var.set(f"正在修复几何问题... {done}/{total}")
+
+    def _on_dialog_destroy(self, event):
+        """弹窗销毁时取消尚未开始的后台修复，不再等待工作线程"""
+        if event.widget is self.dialog:
+            self._fix_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fix_geometries_parallel(self, geoms, tolerance, snap):
+        """分块在线程池中整列修复几何（工作线程），返回(修复后的几何数组, 失败数量)"""
+        chunks = np.array_split(np.arange(len(geoms)), max(1, -(-len(geoms) // _FIX_CHUNK_SIZE)))
+        fixed_geoms = np.array(geoms, dtype=object)
+        error_count = 0
+
+        with ThreadPoolExecutor(max_workers=min(8, len(chunks))) as executor:
+            futures = {executor.submit(self.fix_geometry_bulk, geoms[chunk], tolerance, snap): chunk
+                       for chunk in chunks}
+            for done, future in enumerate(as_completed(futures), 1):
+                chunk = futures[future]
                 try:
-                    original_geom = row.geometry
-                    fixed_geom = self.fix_geometry(original_geom, tolerance)
-
-                    if fixed_geom != original_geom:
-                        self.modified_gdf.at[idx, 'geometry'] = fixed_geom
-                        fixed_count += 1
-                except Exception as fix_error:
-                    logger.warning(f"修复几何 {idx} 失败: {fix_error}")
-                    error_count += 1
-                    continue
+                    fixed_geoms[chunk] = future.result()
+                except Exception as bulk_error:
+                    # 批量修复失败时退回逐个修复以定位出错要素，出错的几何保持原样
+                    logger.warning(f"批量修复几何失败，改为逐个修复: {bulk_error}")
+                    for pos in chunk:
+                        try:
+                            fixed_geoms[pos] = self.fix_geometry_bulk(geoms[pos:pos + 1], tolerance, snap)[0]
+                        except Exception as fix_error:
+                            logger.warning(f"修复几何 {pos} 失败: {fix_error}")
+                            error_count += 1
 
-            # 更新界面
-            self.populate_geometry_list()
-            self.detect_issues()
-            self.update_geometry_visualization()
+                # 只写入进度，由主线程轮询显示
+                self._fix_progress = (done, len(chunks))
 
-            # 显示修复结果
-            result_message = f"已修复 {fixed_count} 个几何要素"
-            if gap_repair_count > 0:
-                result_message += f"\n修复了 {gap_repair_count} 个面缝隙"
-            if error_count > 0:
-                result_message += f"\n{error_count} 个几何修复失败"
+        return fixed_geoms, error_count
 
-            self.status_var.set(f"修复完成: {fixed_count} 成功, {error_count} 失败")
-            messagebox.showinfo("修复完成", result_message)
+    def _on_auto_fix_done(self, future, source_gdf):
+        """一键修复完成后在主线程中应用结果并更新界面"""
+        self._fixing = False
 
+        try:
+            fixed_gdf, fixed_count, error_count, gap_repair_count = future.result()
         except Exception as e:
             logger.error(f"自动修复失败: {e}")
+            self.status_var.set("修复失败")
             messagebox.showerror("错误", f"自动修复失败: {str(e)}")
+            return
+
+        if self.modified_gdf is not source_gdf:
+            # 修复期间数据已被撤销或重新加载，放弃本次结果
+            self.status_var.set("数据已变化，已放弃本次修复结果")
+            return
+
+        self.modified_gdf = fixed_gdf
+        # 几何已被修改，清除派生列缓存
+        self._invalidate_geom_cache()
+
+        # 更新界面
+        self.populate_geometry_list()
+        self.detect_issues()
+        self.update_geometry_visualization()
+
+        # 显示修复结果
+        result_message = f"已修复 {fixed_count} 个几何要素"
+        if gap_repair_count > 0:
+            result_message += f"\n修复了 {gap_repair_count} 个面缝隙"
+        if error_count > 0:
+            result_message += f"\n{error_count} 个几何修复失败"
+
+        self.status_var.set(f"修复完成: {fixed_count} 成功, {error_count} 失败")
+        messagebox.showinfo("修复完成", result_message)
 
     def fix_topology_gaps(self, tolerance: float) -> int:
         """修复面缝隙"""
+        self.modified_gdf, repaired_count = self._repair_topology_gaps(
+            self.modified_gdf, tolerance, self.gap_repair_method.get())
+        self._invalidate_geom_cache()
+        return repaired_count
+
+    def _repair_topology_gaps(self, gdf, tolerance, repair_method):
+        """修复面缝隙，不修改传入的数据，返回(修复后的GeoDataFrame, 修复数量)"""
         try:
             from improved_topology_utils import ImprovedTopologyChecker
 
@@ -712,16 +933,13 @@ class GeometryEditorDialog:
             checker = ImprovedTopologyChecker(tolerance)
 
             # 获取几何体列表
-            geometries = self.modified_gdf.geometry.tolist()
+            geometries = gdf.geometry.tolist()
 
             # 检测缝隙
             gaps = checker.check_topology_gaps_optimized(geometries, tolerance)
 
             if not gaps:
-                return 0
-
-            # 获取修复方法
-            repair_method = self.gap_repair_method.get()
+                return gdf, 0
 
             # 修复缝隙
             repaired_geometries, repair_stats = checker.repair_topology_gaps(
@@ -729,146 +947,81 @@ class GeometryEditorDialog:
             )
 
             # 更新GeoDataFrame
-            self.modified_gdf.geometry = repaired_geometries
+            gdf = gdf.copy()
+            gdf.geometry = repaired_geometries
 
             # 移除已合并的几何体
-            self.modified_gdf = self.modified_gdf[self.modified_gdf.geometry.notna()]
+            gdf = gdf[gdf.geometry.notna()]
 
             logger.info(f"缝隙修复统计: {repair_stats}")
-            return repair_stats.get('repaired_count', 0)
+            return gdf, repair_stats.get('repaired_count', 0)
 
         except ImportError:
             logger.warning("改进的拓扑修复模块不可用")
-            return 0
+            return gdf, 0
         except Exception as e:
             logger.error(f"缝隙修复失败: {e}")
-            return 0
+            return gdf, 0
 
-    def fix_geometry(self, geom, tolerance):
+    def fix_geometry(self, geom, tolerance, snap=None):
         """修复单个几何"""
         if geom is None:
             return geom
 
         try:
-            # 修复无效几何
-            if not geom.is_valid:
-                geom = make_valid(geom)
-
-            # 修复自相交
-            if geom.geom_type == 'Polygon' and not geom.is_simple:
-                geom = geom.buffer(0)
-
-            # 顶点捕捉
-            if self.snap_vertices_var.get():
-                geom = self.snap_vertices(geom, tolerance)
-
-            # 确保几何类型一致
-            if geom.geom_type == 'GeometryCollection':
-                # 提取最大的几何要素
-                try:
-                    # 使用getattr安全地获取geoms属性
-                    geoms_list = getattr(geom, 'geoms', None)
-                    if geoms_list is not None:
-                        geoms = list(geoms_list)
-                        if geoms:
-                            # 找到最大的几何要素
-                            largest_geom = None
-                            max_size = -1
-                            for g in geoms:
-                                try:
-                                    size = getattr(g, 'area', 0) if hasattr(g, 'area') else getattr(g, 'length', 0)
-                                    if size > max_size:
-                                        max_size = size
-                                        largest_geom = g
-                                except Exception:
-                                    continue
-                            if largest_geom is not None:
-                                geom = largest_geom
-                except Exception:
-                    # 如果任何操作失败，保持原几何不变
-                    pass
-
-            # 处理MultiPolygon
-            if geom.geom_type == 'MultiPolygon':
-                try:
-                    # 获取最大的多边形
-                    geoms_list = getattr(geom, 'geoms', None)
-                    if geoms_list is not None:
-                        polygons = list(geoms_list)
-                        if polygons:
-                            largest_polygon = max(polygons, key=lambda p: p.area)
-                            geom = largest_polygon
-                except Exception:
-                    pass
-
-            # 处理MultiLineString
-            if geom.geom_type == 'MultiLineString':
-                try:
-                    # 获取最长的线
-                    geoms_list = getattr(geom, 'geoms', None)
-                    if geoms_list is not None:
-                        lines = list(geoms_list)
-                        if lines:
-                            longest_line = max(lines, key=lambda l: l.length)
-                            geom = longest_line
-                except Exception:
-                    pass
-
-            # 处理MultiPoint
-            if geom.geom_type == 'MultiPoint':
-                try:
-                    # 获取第一个点
-                    geoms_list = getattr(geom, 'geoms', None)
-                    if geoms_list is not None:
-                        points = list(geoms_list)
-                        if points:
-                            geom = points[0]
-                except Exception:
-                    pass
-
-            return geom
-
+            return self.fix_geometry_bulk(np.array([geom], dtype=object), tolerance, snap)[0]
         except Exception as e:
             logger.error(f"修复几何失败: {e}")
             return geom
 
-    def snap_vertices(self, geom, tolerance):
-        """顶点捕捉"""
-        if geom.geom_type == 'Polygon':
-            coords = list(geom.exterior.coords)
-            snapped_coords = self.snap_coordinates(coords, tolerance)
-            return Polygon(snapped_coords)
-        elif geom.geom_type == 'LineString':
-            coords = list(geom.coords)
-            snapped_coords = self.snap_coordinates(coords, tolerance)
-            return LineString(snapped_coords)
-        return geom
-
-    def snap_coordinates(self, coords, tolerance):
-        """坐标捕捉"""
-        if len(coords) < 2:
-            return coords
-
-        snapped = [coords[0]]
-
-        for i in range(1, len(coords)):
-            current = coords[i]
-            prev = snapped[-1]
-
-            # 如果距离小于容差，则捕捉到前一个点
-            if math.sqrt((current[0] - prev[0])**2 + (current[1] - prev[1])**2) < tolerance:
-                continue
-            else:
-                snapped.append(current)
+    def fix_geometry_bulk(self, geoms, tolerance, snap=None):
+        """整列修复几何，返回修复后的几何数组
 
-        return snapped
+        依次进行：修复无效几何、buffer(0)修复自相交面、set_precision顶点捕捉，
+        最后把几何集合/多部件几何归约为单部件（取最大面、最长线、第一个点）。
+        每一步都是对掩码选出的几何做一次shapely向量化调用。
+        snap为是否捕捉顶点，为None时读取界面选项（只能在主线程中这样调用）。
+        """
+        if snap is None:
+            snap = self.snap_vertices_var.get()
+        geoms = np.array(geoms, dtype=object)
+
+        # 修复无效几何
+        invalid = ~shapely.is_valid(geoms) & ~shapely.is_missing(geoms)
+        if invalid.any():
+            geoms[invalid] = shapely.make_valid(geoms[invalid])
+
+        # 修复自相交
+        self_intersecting = (shapely.get_type_id(geoms) == shapely.GeometryType.POLYGON) & ~shapely.is_simple(geoms)
+        if self_intersecting.any():
+            geoms[self_intersecting] = shapely.buffer(geoms[self_intersecting], 0)
+
+        # 顶点捕捉：按容差网格对齐坐标并合并重复顶点，valid_output保证结果仍为有效几何
+        if snap:
+            type_ids = shapely.get_type_id(geoms)
+            snappable = (type_ids == shapely.GeometryType.POLYGON) | (type_ids == shapely.GeometryType.LINESTRING)
+            if snappable.any():
+                originals = geoms[snappable]
+                snapped = shapely.set_precision(originals, tolerance, mode='valid_output')
+                # set_precision会重排环的方向，拓扑上未变化的几何保留原样，避免被误计为已修复
+                unchanged = shapely.equals(snapped, originals)
+                snapped[unchanged] = originals[unchanged]
+                geoms[snappable] = snapped
+
+        # 确保几何类型一致：几何集合取面积最大的部件，再对多部件几何取最大面/最长线/第一个点
+        _reduce_to_largest_part(geoms, shapely.GeometryType.GEOMETRYCOLLECTION, shapely.area)
+        _reduce_to_largest_part(geoms, shapely.GeometryType.MULTIPOLYGON, shapely.area)
+        _reduce_to_largest_part(geoms, shapely.GeometryType.MULTILINESTRING, shapely.length)
+        _reduce_to_largest_part(geoms, shapely.GeometryType.MULTIPOINT, None)
+
+        return geoms
 
     def on_geometry_double_click(self, event):
         """双击几何要素事件"""
         selection = self.geometry_tree.selection()
         if selection:
             item = selection[0]
-            values = self.geometry_tree.item(item)['values']
+            values = self.geometry_tree.item(item, 'values')
             index = int(values[0]) - 1
 
             # 高亮显示选中的几何
@@ -880,59 +1033,28 @@ class GeometryEditorDialog:
         self.selected_features = set()
 
         for item in selection:
-            values = self.geometry_tree.item(item)['values']
+            values = self.geometry_tree.item(item, 'values')
             index = int(values[0]) - 1
             self.selected_features.add(index)
 
         self.status_var.set(f"已选择 {len(self.selected_features)} 个几何要素")
 
     def highlight_geometry(self, index):
-        """高亮显示几何要素"""
-        if self.modified_gdf is None or index >= len(self.modified_gdf):
+        """高亮显示几何要素，index为要素在modified_gdf中的索引标签"""
+        if self.modified_gdf is None:
+            return
+
+        # 缝隙修复会删除行，索引标签与行位置不再一致，绘制时按行位置高亮
+        position = self.modified_gdf.index.get_indexer([index])[0]
+        if position < 0:
             return
 
         try:
             # 清除画布
             self.ax.clear()
 
-            # 重新绘制所有几何要素
-            for idx, row in self.modified_gdf.iterrows():
-                geom = row.geometry
-                if geom is not None:
-                    # 根据几何类型绘制
-                    if geom.geom_type == 'Polygon':
-                        coords = list(geom.exterior.coords)
-                        if len(coords) > 2:
-                            x_coords = [coord[0] for coord in coords]
-                            y_coords = [coord[1] for coord in coords]
-                            # 如果是选中的几何，用不同颜色高亮
-                            if idx == index:
-                                self.ax.fill(x_coords, y_coords, alpha=0.7, color='red', edgecolor='red', linewidth=2)
-                            else:
-                                self.ax.fill(x_coords, y_coords, alpha=0.3, edgecolor='black', linewidth=1)
-                            self.ax.plot(x_coords, y_coords, 'k-', linewidth=1)
-
-                    elif geom.geom_type == 'LineString':
-                        coords = list(geom.coords)
-                        if len(coords) > 1:
-                            x_coords = [coord[0] for coord in coords]
-                            y_coords = [coord[1] for coord in coords]
-                            # 如果是选中的几何，用不同颜色高亮
-                            if idx == index:
-                                self.ax.plot(x_coords, y_coords, 'r-', linewidth=4)
-                            else:
-                                self.ax.plot(x_coords, y_coords, 'b-', linewidth=2)
-
-                    elif geom.geom_type == 'Point':
-                        coords = list(geom.coords)
-                        if coords:
-                            x_coords = [coord[0] for coord in coords]
-                            y_coords = [coord[1] for coord in coords]
-                            # 如果是选中的几何，用不同颜色高亮
-                            if idx == index:
-                                self.ax.scatter(x_coords, y_coords, c='red', s=100, zorder=5)
-                            else:
-                                self.ax.scatter(x_coords, y_coords, c='blue', s=50, zorder=5)
+            # 重新绘制所有几何要素，选中的几何用不同颜色高亮
+            self._draw_geometries(highlight=position)
 
             # 设置坐标轴
             self.ax.set_aspect('equal')
@@ -1008,6 +1130,7 @@ class GeometryEditorDialog:
         if messagebox.askyesno("确认", "确定要撤销所有修改吗？"):
             if self.original_gdf is not None:
                 self.modified_gdf = self.original_gdf.copy()
+                self._invalidate_geom_cache()
                 self.populate_geometry_list()
                 self.detect_issues()
                 self.update_geometry_visualization()
@@ -3829,7 +3829,6 @@ DBF文件数量: {summary['dbf_files']}
                     return
 
                 # 获取选中的字段信息
-                selected_item = tree.item(selection[0])
                 selected_index = tree.index(selection[0])
                 key, info = field_items[selected_index]
 
@@ -4541,7 +4540,6 @@ DBF文件数量: {summary['dbf_files']}
                     return
 
                 # 获取选中的文件信息
-                selected_item = tree.item(selection[0])
                 selected_index = tree.index(selection[0])
                 key, info = file_items[selected_index]
 